@@ -2,15 +2,20 @@
 A demo adapter for the IRI Facility API that returns hardcoded data.
 This is useful for testing and development of the API without needing to connect to real resources
 """
+import asyncio
 import base64
+import collections
 import datetime
+import functools
 import glob
 import grp
 import json
+import mmap
 import os
 import pathlib
 import pwd
 import random
+import shutil
 import stat
 import subprocess
 import time
@@ -47,14 +52,17 @@ from .idempotency import IdempotencyStore, LockState
 logger = get_stream_logger(__name__, LOG_LEVEL)
 
 DEMO_QUEUE_UPDATE_SECS = int(os.environ.get("DEMO_QUEUE_UPDATE_SECS", 5))
+# How many directories a recursive ls reads concurrently (each read runs in a worker thread)
+DEMO_LS_CONCURRENCY = int(os.environ.get("DEMO_LS_CONCURRENCY", 8))
+# How much stderr of a long-running command (tar) is kept for diagnostics
+_STDERR_TAIL_BYTES = 64 * 1024
 
 
-def paginate_list(items, offset: int | None, limit: int | None):
-    """Return a sliced items using offset and limit."""
-    if offset is not None and offset > 0:
-        items = items[offset:]
-    if limit is not None and limit >= 0:
-        items = items[:limit]
+def _smallest_bucket(items, *buckets):
+    """Return the shortest of items and the index buckets for the filters that are set (None for unset filters)."""
+    for bucket in buckets:
+        if bucket is not None and len(bucket) < len(items):
+            items = bucket
     return items
 
 
@@ -250,6 +258,42 @@ def utc_timestamp() -> int:
     return int(utc_now().timestamp())
 
 
+# uid/gid -> name lookups go through NSS (possibly LDAP/SSSD over the network) and repeat for every entry of a listing
+@functools.lru_cache(maxsize=1024)
+def _user_name(uid: int) -> str:
+    return pwd.getpwuid(uid).pw_name
+
+
+@functools.lru_cache(maxsize=1024)
+def _group_name(gid: int) -> str:
+    return grp.getgrgid(gid).gr_name
+
+
+# Line scans over an mmap: find/rfind are memchr-backed, so no line is ever materialized in Python
+def _skip_lines(mm: mmap.mmap, count: int) -> int:
+    """Offset just past the first `count` lines."""
+    pos = 0
+    for _ in range(count):
+        nl = mm.find(b"\n", pos)
+        if nl < 0:
+            return len(mm)
+        pos = nl + 1
+    return pos
+
+
+def _last_lines_start(mm: mmap.mmap, count: int) -> int:
+    """Offset of the first of the last `count` lines (a final line without a newline counts)."""
+    end = len(mm)
+    if mm[end - 1] == ord("\n"):
+        end -= 1
+    for _ in range(count):
+        nl = mm.rfind(b"\n", 0, end)
+        if nl < 0:
+            return 0
+        end = nl
+    return min(end + 1, len(mm))
+
+
 class DemoAdapter(
     status_adapter.FacilityAdapter, account_adapter.FacilityAdapter, compute_adapter.FacilityAdapter,
     filesystem_adapter.FacilityAdapter, storage_adapter.FacilityAdapter,
@@ -719,6 +763,42 @@ class DemoAdapter(
 
             d += datetime.timedelta(minutes=int(random.random() * 15 + 1))
 
+        self._index_status()
+
+    def _index_status(self):
+        """Index the status collections once they are loaded: by id, and by the exact-match filters find() supports."""
+        self._resources_by_id = {r.id: r for r in self.resources}
+        self._resources_by_group = collections.defaultdict(list)
+        self._resources_by_type = collections.defaultdict(list)
+        self._resources_by_status = collections.defaultdict(list)
+        self._resources_by_site = collections.defaultdict(list)
+        self._resources_by_capability = collections.defaultdict(list)
+        for r in self.resources:
+            self._resources_by_group[r.group].append(r)
+            self._resources_by_type[r.resource_type].append(r)
+            self._resources_by_status[r.current_status].append(r)
+            self._resources_by_site[r.site_id].append(r)
+            for cap_id in r.capability_ids:
+                self._resources_by_capability[cap_id].append(r)
+        self._events_by_id = {e.id: e for e in self.events}
+        self._incidents_by_id = {i.id: i for i in self.incidents}
+        self._events_by_status = collections.defaultdict(list)
+        self._events_by_resource = collections.defaultdict(list)
+        self._events_by_incident = collections.defaultdict(list)
+        for e in self.events:
+            self._events_by_status[e.status].append(e)
+            self._events_by_resource[e.resource_id].append(e)
+            if e.incident_id:
+                self._events_by_incident[e.incident_id].append(e)
+        self._incidents_by_status = collections.defaultdict(list)
+        self._incidents_by_type = collections.defaultdict(list)
+        self._incidents_by_resource = collections.defaultdict(list)
+        for i in self.incidents:
+            self._incidents_by_status[i.status].append(i)
+            self._incidents_by_type[i.type].append(i)
+            for resource_id in dict.fromkeys(i.resource_ids):
+                self._incidents_by_resource[resource_id].append(i)
+
     # ----------------------------
     # Facility API
     # ----------------------------
@@ -774,8 +854,17 @@ class DemoAdapter(
         capability: Capability | None = None,
         site_id: str | None = None,
     ) -> list[status_models.Resource]:
-        resources = status_models.Resource.find(
+        # Start from the smallest index bucket for the filters given; find() still applies every filter
+        candidates = _smallest_bucket(
             self.resources,
+            self._resources_by_group.get(group, []) if group else None,
+            self._resources_by_type.get(resource_type, []) if resource_type else None,
+            self._resources_by_status.get(current_status, []) if current_status else None,
+            self._resources_by_site.get(site_id, []) if site_id else None,
+            self._resources_by_capability.get(capability[0], []) if capability and len(capability) == 1 else None,
+        )
+        resources = status_models.Resource.find(
+            candidates,
             name=name,
             description=description,
             group=group,
@@ -784,11 +873,13 @@ class DemoAdapter(
             current_status=current_status,
             capability=capability,
             site_id=site_id,
+            offset=offset,
+            limit=limit,
         )
-        return paginate_list(resources, offset, limit)
+        return resources
 
     async def get_resource(self: "DemoAdapter", id_: str) -> status_models.Resource:
-        return status_models.Resource.find_by_id(self.resources, id_)
+        return self._resources_by_id.get(id_)
 
     async def get_resources_for_endpoint(self: "DemoAdapter", endpoint: status_models.Endpoint) -> list[status_models.Resource]:
         return [r for r in self.resources if endpoint in r.supported_endpoints]
@@ -807,8 +898,15 @@ class DemoAdapter(
         time_: datetime.datetime | None = None,
         modified_since: datetime.datetime | None = None,
     ) -> list[status_models.Event]:
-        events = status_models.Event.find(
+        # An id filter narrows to that id's posting list; find() still applies every filter
+        candidates = _smallest_bucket(
             self.events,
+            self._events_by_incident.get(incident_id, []) if incident_id else None,
+            self._events_by_resource.get(resource_id, []) if resource_id else None,
+            self._events_by_status.get(status, []) if status else None,
+        )
+        events = status_models.Event.find(
+            candidates,
             incident_id=incident_id,
             resource_id=resource_id,
             name=name,
@@ -818,11 +916,13 @@ class DemoAdapter(
             to=to,
             time_=time_,
             modified_since=modified_since,
+            offset=offset,
+            limit=limit,
         )
-        return paginate_list(events, offset, limit)
+        return events
 
     async def get_event(self: "DemoAdapter", id_: str) -> status_models.Event:
-        return status_models.Event.find_by_id(self.events, id_)
+        return self._events_by_id.get(id_)
 
     async def get_incidents(
         self: "DemoAdapter",
@@ -839,8 +939,15 @@ class DemoAdapter(
         resource_id: str | None = None,
         resolution: status_models.Resolution | None = None,
     ) -> list[status_models.Incident]:
-        incidents = status_models.Incident.find(
+        # Start from the smallest of the resource/status/type buckets; find() still applies every filter
+        candidates = _smallest_bucket(
             self.incidents,
+            self._incidents_by_resource.get(resource_id, []) if resource_id else None,
+            self._incidents_by_status.get(status, []) if status else None,
+            self._incidents_by_type.get(type_, []) if type_ else None,
+        )
+        incidents = status_models.Incident.find(
+            candidates,
             name=name,
             description=description,
             status=status,
@@ -851,11 +958,13 @@ class DemoAdapter(
             modified_since=modified_since,
             resource_id=resource_id,
             resolution=resolution,
+            offset=offset,
+            limit=limit,
         )
-        return paginate_list(incidents, offset, limit)
+        return incidents
 
     async def get_incident(self: "DemoAdapter", id_: str) -> status_models.Incident:
-        return status_models.Incident.find_by_id(self.incidents, id_)
+        return self._incidents_by_id.get(id_)
 
     async def get_capabilities(self: "DemoAdapter", name: str | None = None, modified_since: str | None = None, offset: int = 0, limit: int = 1000) -> list[Capability]:
         return self.capabilities.values()
@@ -1142,12 +1251,46 @@ class DemoAdapter(
             logger.warning(f"OS error running command: {args}\nError: {exc}")
             raise CommandError(cmd=args, returncode=None, stdout=None, stderr=str(exc)) from exc
 
+    async def _run_async(self, args, *, timeout: int | None = 3600) -> None:
+        """
+        Run a long command (tar) as an asyncio subprocess so the event loop stays responsive; cancelling the
+        caller kills the process. stdout is discarded and only the last `_STDERR_TAIL_BYTES` of stderr are kept.
+        Raises CommandError on failure with captured diagnostics.
+        """
+        args = [str(a) for a in args]
+        try:
+            proc = await asyncio.create_subprocess_exec(*args, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE)
+        except OSError as exc:
+            logger.warning(f"OS error running command: {args}\nError: {exc}")
+            raise CommandError(cmd=args, returncode=None, stdout=None, stderr=str(exc)) from exc
+
+        stderr = bytearray()
+
+        async def drain_stderr():
+            while chunk := await proc.stderr.read(65536):
+                stderr.extend(chunk)
+                del stderr[:-_STDERR_TAIL_BYTES]
+
+        try:
+            await asyncio.wait_for(asyncio.gather(drain_stderr(), proc.wait()), timeout)
+        except TimeoutError as exc:
+            logger.warning(f"Command timed out: {args} (after {timeout} seconds)")
+            raise CommandError(cmd=args, returncode=None, stdout=None, stderr=stderr.decode(errors="replace")) from exc
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+        if proc.returncode:
+            err = stderr.decode(errors="replace")
+            logger.warning(f"Command failed: {args} (rc={proc.returncode})\nstderr: {err}")
+            raise CommandError(cmd=args, returncode=proc.returncode, stdout=None, stderr=err)
 
     def _file(self, path: str) -> filesystem_models.File:
         # Get file stats (follows symlinks by default)
         rp = self.validate_path(path)
-        file_stat = os.stat(rp)  # Use lstat to not follow symlinks
+        return self._file_from_stat(os.path.basename(rp), rp, os.stat(rp))
 
+    def _file_from_stat(self, name: str, path: str, file_stat: os.stat_result, numeric_uid: bool = False) -> filesystem_models.File:
         # Get file type
         if stat.S_ISDIR(file_stat.st_mode):
             file_type = "directory"
@@ -1161,11 +1304,15 @@ class DemoAdapter(
         # Get link target if it's a symlink
         link_target = None
         if stat.S_ISLNK(file_stat.st_mode):
-            link_target = os.readlink(rp)
+            link_target = os.readlink(path)
 
-        # Get user and group names
-        user = pwd.getpwuid(file_stat.st_uid).pw_name
-        group = grp.getgrgid(file_stat.st_gid).gr_name
+        # Get user and group names (or ids)
+        if numeric_uid:
+            user = str(file_stat.st_uid)
+            group = str(file_stat.st_gid)
+        else:
+            user = _user_name(file_stat.st_uid)
+            group = _group_name(file_stat.st_gid)
 
         # Get permissions in rwxrwxrwx format
         permissions = stat.filemode(file_stat.st_mode)
@@ -1176,7 +1323,7 @@ class DemoAdapter(
         # Get size
         size = str(file_stat.st_size)
         data = dict(
-            name=os.path.basename(rp),
+            name=name,
             type=file_type,
             user=user,
             group=group,
@@ -1190,6 +1337,82 @@ class DemoAdapter(
 
         return filesystem_models.File(**data)
 
+    def _scan_dir(
+        self, path: str, prefix: str, show_hidden: bool, numeric_uid: bool, dereference: bool
+    ) -> tuple[list[filesystem_models.File], list[tuple[os.DirEntry, os.stat_result, str]]]:
+        """
+        Read one directory with scandir: each entry is stat-ed once, and its d_type answers the directory check for free.
+        As with ls, an entry that cannot be stat-ed does not fail the listing: a dangling symlink is reported as the link
+        itself, and anything else unreadable is skipped.
+        """
+        files = []
+        subdirs = []
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        for entry in entries:
+            if not show_hidden and entry.name.startswith("."):
+                continue
+            name = prefix + entry.name
+            try:
+                try:
+                    entry_stat = entry.stat(follow_symlinks=dereference)
+                except OSError:
+                    if not (dereference and entry.is_symlink()):
+                        raise
+                    # Broken link: describe the link, and don't try to descend into it
+                    files.append(self._file_from_stat(name, entry.path, entry.stat(follow_symlinks=False), numeric_uid))
+                    continue
+                files.append(self._file_from_stat(name, entry.path, entry_stat, numeric_uid))
+                if entry.is_dir(follow_symlinks=dereference):
+                    subdirs.append((entry, entry_stat, name))
+            except OSError as exc:
+                logger.warning(f"ls: cannot access {entry.path}: {exc}")
+        return files, subdirs
+
+    async def _ls_dir(
+        self, root: str, show_hidden: bool, numeric_uid: bool, recursive: bool, dereference: bool
+    ) -> list[filesystem_models.File]:
+        """
+        List a directory. Recursive listings walk the tree breadth-first from an explicit queue (no Python recursion);
+        the directories of each level are read concurrently in worker threads, at most `DEMO_LS_CONCURRENCY` at a time,
+        so slow (networked) directory reads overlap instead of queuing up behind each other.
+        """
+        sem = asyncio.Semaphore(DEMO_LS_CONCURRENCY)
+
+        async def scan(path: str, prefix: str):
+            async with sem:
+                try:
+                    return await asyncio.to_thread(self._scan_dir, path, prefix, show_hidden, numeric_uid, dereference)
+                except OSError as exc:
+                    if not prefix:
+                        raise
+                    # An unreadable subdirectory is still listed (by its parent); only its contents are left out
+                    logger.warning(f"ls: cannot open directory {path}: {exc}")
+                    return [], []
+
+        files = []
+        root_stat = os.stat(root)
+        # Each queued directory carries the (st_dev, st_ino) of itself and its ancestors
+        level = [(root, "", frozenset({(root_stat.st_dev, root_stat.st_ino)}))]
+        while level:
+            results = await asyncio.gather(*(scan(path, prefix) for path, prefix, _ in level))
+            next_level = []
+            # Results come back in level order, so the listing stays deterministic
+            for (_, _, ancestors), (dir_files, subdirs) in zip(level, results):
+                files.extend(dir_files)
+                if not recursive:
+                    continue
+                for entry, entry_stat, name in subdirs:
+                    # With dereference, a symlink can point back up the tree or out of the sandbox: like `ls -RL`,
+                    # don't descend into a directory that is its own ancestor, nor through a link that leaves the sandbox
+                    key = (entry_stat.st_dev, entry_stat.st_ino)
+                    if key in ancestors:
+                        continue
+                    if entry.is_symlink() and not os.path.realpath(entry.path).startswith(PathSandbox.get_base_temp_dir() + os.sep):
+                        continue
+                    next_level.append((entry.path, name + "/", ancestors | {key}))
+            level = next_level
+        return files
 
     async def chmod(self: "DemoAdapter", resource: status_models.Resource, user: User, request_model: filesystem_models.PutFileChmodRequest) -> filesystem_models.PutFileChmodResponse:
         rp = self.validate_path(request_model.path)
@@ -1217,8 +1440,36 @@ class DemoAdapter(
         dereference: bool,
     ) -> filesystem_models.GetDirectoryLsResponse:
         rp = self.validate_path(path)
-        files = glob.glob(rp, recursive=recursive)
-        return filesystem_models.GetDirectoryLsResponse(output=[self._file(f) for f in files])
+        files = []
+        for match in sorted(glob.glob(rp, recursive=recursive)):
+            if os.path.isdir(match) and (dereference or not os.path.islink(match)):
+                files.extend(await self._ls_dir(match, show_hidden, numeric_uid, recursive, dereference))
+            else:
+                # A dangling symlink is described as the link itself, as in a directory listing
+                file_stat = os.stat(match) if dereference and os.path.exists(match) else os.lstat(match)
+                files.append(self._file_from_stat(os.path.basename(match), match, file_stat, numeric_uid))
+        return filesystem_models.GetDirectoryLsResponse(output=files)
+
+    def _read_range(self: "DemoAdapter", rp: str, start: int, length: int) -> bytes:
+        """
+        Read `length` bytes at offset `start` with positional reads into one preallocated buffer:
+        no subprocess, no shell, no seek, and no intermediate chunk objects.
+        """
+        buf = bytearray(length)
+        view = memoryview(buf)
+        read = 0
+        fd = os.open(rp, os.O_RDONLY)
+        try:
+            if length:
+                filesystem_adapter.fadvise(fd, start, length, "POSIX_FADV_SEQUENTIAL")
+            while read < length and (n := os.preadv(fd, [view[read:]], start + read)):
+                read += n
+            if read:
+                # The bytes are copied out; don't let one-off reads push other workloads' pages out of the cache
+                filesystem_adapter.fadvise(fd, start, read, "POSIX_FADV_DONTNEED")
+        finally:
+            os.close(fd)
+        return view[:read].tobytes()
 
     def _headtail(
         self: "DemoAdapter",
@@ -1229,29 +1480,32 @@ class DemoAdapter(
         skip_heading: bool = False,
         skip_trailing: bool = False,
     ) -> str:
-        args = [cmd]
-
-        if cmd == "tail" and skip_heading:
-            if file_bytes is not None:
-                args.extend(["-c", f"+{file_bytes + 1}"])
-            elif lines is not None:
-                args.extend(["-n", f"+{lines + 1}"])
-        if cmd == "head" and skip_trailing:
-            if file_bytes is not None:
-                args.extend(["-c", f"-{file_bytes}"])
-            elif lines is not None:
-                args.extend(["-n", f"-{lines}"])
-        else:
-            if file_bytes is not None:
-                args.extend(["-c", str(file_bytes)])
-            elif lines is not None:
-                args.extend(["-n", str(lines)])
-
         rp = self.validate_path(path)
-        args.append(rp)
-
-        result = self._run(args)
-        return result.stdout
+        size = os.path.getsize(rp)
+        if file_bytes is not None:
+            # Byte ranges are plain offset reads: compute the range from the file size instead of running head/tail
+            if cmd == "head" and file_bytes < 0:
+                # `head -c -NUM`
+                file_bytes, skip_trailing = -file_bytes, True
+            if cmd == "head":
+                start, end = 0, (size - file_bytes if skip_trailing else file_bytes)
+            else:
+                start, end = ((file_bytes, size) if skip_heading else (size - file_bytes, size))
+            start = min(max(start, 0), size)
+            # A byte range can cut through a multi-byte character
+            return self._read_range(rp, start, max(min(end, size) - start, 0)).decode(errors="replace")
+
+        if size == 0:
+            return ""
+        if cmd == "head" and lines < 0:
+            # `head -n -NUM`
+            lines, skip_trailing = -lines, True
+        with open(rp, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if cmd == "head":
+                start, end = 0, (_last_lines_start(mm, lines) if skip_trailing else _skip_lines(mm, lines))
+            else:
+                start, end = (_skip_lines(mm, lines) if skip_heading else _last_lines_start(mm, lines)), size
+            return mm[start:end].decode(errors="replace")
 
     async def head(
         self: "DemoAdapter",
@@ -1262,7 +1516,7 @@ class DemoAdapter(
         lines: int | None,
         skip_trailing: bool = False,
     ) -> filesystem_models.GetFileHeadResponse:
-        content = self._headtail("head", path, file_bytes, lines, skip_trailing=skip_trailing)
+        content = await asyncio.to_thread(self._headtail, "head", path, file_bytes, lines, skip_trailing=skip_trailing)
 
         fc = filesystem_models.FileContent(
             content=content,
@@ -1284,7 +1538,7 @@ class DemoAdapter(
         skip_heading: bool = False,
     ) -> filesystem_models.GetFileTailResponse:
 
-        content = self._headtail("tail", path, file_bytes, lines, skip_heading=skip_heading)
+        content = await asyncio.to_thread(self._headtail, "tail", path, file_bytes, lines, skip_heading=skip_heading)
 
         fc = filesystem_models.FileContent(
             content=content,
@@ -1300,21 +1554,20 @@ class DemoAdapter(
 
     async def view(self: "DemoAdapter", resource: status_models.Resource, user: User, path: str, size: int, offset: int) -> filesystem_models.GetViewFileResponse:
         rp = self.validate_path(path)
-        result = self._run(f"tail -c +{offset + 1} {rp} | head -c {size}", shell=True)
-        content = result.stdout
+        data = await asyncio.to_thread(self._read_range, rp, offset, max(min(size, os.path.getsize(rp) - offset), 0))
+        content = data.decode(errors="replace")
         return filesystem_models.GetViewFileResponse(
             output=filesystem_models.FileContent(
                 content=content,
                 content_type=filesystem_models.ContentUnit.bytes,
                 start_position=offset,
-                end_position=offset + len(content)
+                end_position=offset + len(data)
             ),
         )
 
     async def checksum(self: "DemoAdapter", resource: status_models.Resource, user: User, path: str) -> filesystem_models.GetFileChecksumResponse:
         rp = self.validate_path(path)
-        result = self._run(["sha256sum", rp])
-        checksum = result.stdout.split()[0]
+        checksum = await filesystem_adapter.stream_sha256(rp)
         return filesystem_models.GetFileChecksumResponse(
             output=filesystem_models.FileChecksum(
                 checksum=checksum,
@@ -1358,16 +1611,22 @@ class DemoAdapter(
         rp = self.validate_path(path)
         if rp == PathSandbox.get_base_temp_dir():
             raise HTTPException(status_code=400, detail="Cannot delete sandbox")
-        self._run(["rm", "-rf", rp])
+        # `rm -rf` without the fork/exec: the sandbox is local, so remove it with direct syscalls
+        if os.path.isdir(rp) and not os.path.islink(rp):
+            shutil.rmtree(rp)
+        else:
+            try:
+                os.unlink(rp)
+            except FileNotFoundError:
+                pass
         return filesystem_models.RemoveResponse(output=f"Removed {rp}")
 
     async def mkdir(self: "DemoAdapter", resource: status_models.Resource, user: User, request_model: filesystem_models.PostMakeDirRequest) -> filesystem_models.PostMkdirResponse:
         rp = self.validate_path(request_model.path)
-        args = ["mkdir"]
         if request_model.parent:
-            args.append("-p")
-        args.append(rp)
-        self._run(args)
+            os.makedirs(rp, exist_ok=True)
+        else:
+            os.mkdir(rp)
         return filesystem_models.PostMkdirResponse(output=self._file(rp))
 
     async def symlink(
@@ -1375,14 +1634,21 @@ class DemoAdapter(
     ) -> filesystem_models.PostFileSymlinkResponse:
         rp_src = self.validate_path(request_model.path)
         rp_dst = self.validate_path(request_model.link_path)
-        self._run(["ln", "-s", rp_src, rp_dst])
+        # Like `ln -s`, a link made into an existing directory is created inside it
+        os.symlink(rp_src, os.path.join(rp_dst, os.path.basename(rp_src)) if os.path.isdir(rp_dst) else rp_dst)
         return filesystem_models.PostFileSymlinkResponse(output=self._file(rp_dst))
 
     async def download(self: "DemoAdapter", resource: status_models.Resource, user: User, path: str) -> filesystem_models.GetFileDownloadResponse:
         rp = self.validate_path(path)
-        raw_content = pathlib.Path(rp).read_bytes()
+        limit = filesystem_adapter.OPS_SIZE_LIMIT
+        # Check the size before reading, and never read more than one byte past the limit (the file may grow meanwhile)
+        if os.path.getsize(rp) > limit:
+            raise Exception("File to download is too large.")
+        with open(rp, "rb") as f:
+            raw_content = f.read(limit + 1)
+            filesystem_adapter.fadvise(f.fileno(), 0, len(raw_content), "POSIX_FADV_DONTNEED")
 
-        if len(raw_content) > filesystem_adapter.OPS_SIZE_LIMIT:
+        if len(raw_content) > limit:
             raise Exception("File to download is too large.")
 
         return filesystem_models.GetFileDownloadResponse(
@@ -1422,7 +1688,7 @@ class DemoAdapter(
         args.append(PathSandbox.get_base_temp_dir())
         p = pathlib.Path(src_rp)
         args.append(p.relative_to(PathSandbox.get_base_temp_dir()))
-        subprocess.run(args, check=True)
+        await self._run_async(args)
 
         return filesystem_models.PostCompressResponse(output=self._file(dst_rp))
 
@@ -1449,7 +1715,7 @@ class DemoAdapter(
         args.append(src_rp)
         args.append("-C")
         args.append(dst_rp)
-        subprocess.run(args, check=True)
+        await self._run_async(args)
 
         return filesystem_models.PostExtractResponse(output=self._file(dst_rp))
 
@@ -4,8 +4,12 @@
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+import orjson
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.routing import request_response
 from opentelemetry import trace, metrics
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
@@ -60,11 +64,42 @@ if config.OPENTELEMETRY_ENABLED:
 @asynccontextmanager
 async def _lifespan(app: FastAPI):
     app.state.idempotency_store = create_store()
+    # Build the OpenAPI document now rather than on the first request for it
+    if _OPENAPI_URL:
+        _render_openapi(app, app.root_path.rstrip("/"))
     yield
     await app.state.idempotency_store.close()
 
 
-APP = FastAPI(servers=[{"url": config.API_URL_ROOT}], lifespan=_lifespan, **config.API_CONFIG)
+def _render_openapi(app: FastAPI, root_path: str = "") -> bytes:
+    """Return the OpenAPI document as JSON bytes, rendering it once per app and root path."""
+    rendered = getattr(app.state, "openapi_rendered", None)
+    if rendered is None:
+        rendered = app.state.openapi_rendered = {}
+    if root_path not in rendered:
+        schema = app.openapi()
+        # As FastAPI's own route does: behind a root path, list it as the first server
+        servers = schema.get("servers") or []
+        if root_path and app.root_path_in_servers and root_path not in {s.get("url") for s in servers}:
+            schema = {**schema, "servers": [{"url": root_path}, *servers]}
+        rendered[root_path] = orjson.dumps(schema)
+    return rendered[root_path]
+
+
+async def _openapi(request: Request) -> Response:
+    return Response(_render_openapi(request.app, request.scope.get("root_path", "").rstrip("/")), media_type="application/json")
+
+
+# FastAPI's own OpenAPI route re-encodes the schema on every request. The app is created without it, the
+# pre-rendered document is registered on the configured URL (gzip-compressed for clients that accept it),
+# and only then does FastAPI's setup() add its docs pages, which point at that URL. The OpenAPI route
+# setup() adds alongside them sits behind ours and is never matched.
+_OPENAPI_URL = config.API_CONFIG.get("openapi_url", "/openapi.json")
+APP = FastAPI(servers=[{"url": config.API_URL_ROOT}], lifespan=_lifespan, default_response_class=ORJSONResponse, **{**config.API_CONFIG, "openapi_url": None})
+if _OPENAPI_URL:
+    APP.add_route(_OPENAPI_URL, GZipMiddleware(request_response(_openapi)), include_in_schema=False)
+    APP.openapi_url = _OPENAPI_URL
+    APP.setup()
 
 
 class _ExternalRequestContextMiddleware(BaseHTTPMiddleware):
@@ -7,6 +7,7 @@ from . import config
 
 _api_url_base: ContextVar[str | None] = ContextVar("_api_url_base", default=None)
 _iri_facility_project: ContextVar[str | None] = ContextVar("_iri_facility_project", default=None)
+_default_url_prefix = f"{config.API_URL_ROOT}{config.API_PREFIX}{config.API_URL}"
 
 
 def _first_header_value(value: str | None) -> str:
@@ -32,7 +33,7 @@ def get_url_prefix() -> str:
     value = _api_url_base.get()
     if value:
         return value
-    return f"{config.API_URL_ROOT}{config.API_PREFIX}{config.API_URL}"
+    return _default_url_prefix
 
 
 def get_iri_facility_project() -> str | None:
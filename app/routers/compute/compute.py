@@ -1,6 +1,6 @@
 """Compute resource API router"""
 
-from fastapi import Depends, Header, Query, Request, status
+from fastapi import Depends, Header, Query, Request, Response, status
 
 from ...idempotency import build_body_hash, build_cache_key, run_with_idempotency
 from ...types.http import forbidExtraQueryParams
@@ -185,7 +185,7 @@ async def get_job_statuses(
     "/cancel/{resource_id:str}/{job_id:str}",
     status_code=status.HTTP_204_NO_CONTENT,
     response_model=None,
-    response_model_exclude_unset=True,
+    response_class=Response,
     responses=DEFAULT_RESPONSES,
     operation_id="cancelJob",
     openapi_extra=iri_meta_dict("production", "required")
@@ -196,11 +196,11 @@ async def cancel_job(
     request: Request,
     user: User = Depends(router.current_user),
     _forbid=Depends(forbidExtraQueryParams()),
-):
+) -> Response:
     """Cancel a job"""
     # look up the resource (todo: maybe ensure it's available)
     resource = await status_router.adapter.get_resource(resource_id)
 
     await router.adapter.cancel_job(resource=resource, user=user, job_id=job_id)
 
-    return None
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
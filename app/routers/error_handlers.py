@@ -3,26 +3,40 @@
 Default problem schema and example responses for various HTTP status codes.
 """
 
+import functools
 import logging
-from urllib.parse import urlsplit, urlunsplit, quote
+import string
+from types import MappingProxyType
+from typing import Annotated, TypedDict
+from urllib.parse import urlunsplit, quote
 
+import orjson
 from pydantic import BaseModel, Field, ConfigDict
 
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import Response
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from .. import config
 
+log = logging.getLogger(__name__)
+
+
+# Only used for typing and the schema; handlers emit plain dicts of this shape
+class InvalidParam(TypedDict):
+    name: Annotated[str, Field(description="The name of the invalid parameter.", example="modified_since")]
+    reason: Annotated[str, Field(description="Why the parameter is invalid.", example="Invalid datetime format")]
+
 
 class Problem(BaseModel):
-    model_config = ConfigDict(extra="allow", json_schema_extra={"description": 'Error structure for REST interface based on RFC 9457, "Problem Details for HTTP APIs."'})
+    model_config = ConfigDict(extra="forbid", frozen=True, defer_build=True, json_schema_extra={"description": 'Error structure for REST interface based on RFC 9457, "Problem Details for HTTP APIs."'})
     type: str = Field(..., description="A URI reference that identifies the problem type.", example="https://example.com/notFound", json_schema_extra={"format": "uri", "default": "about:blank"})
     status: int = Field(..., ge=100, le=599, description="The HTTP status code for this occurrence.", example=404)
     title: str|None = Field(default=None, description="Short human-readable summary.", example="Not Found")
     detail: str|None = Field(default=None, description="Human-readable explanation.", example="Descriptive text.")
     instance: str = Field(..., description="A URI reference identifying this occurrence.", example=f"http://localhost/{config.API_URL}/resource/123")
+    invalid_params: list[InvalidParam]|None = Field(default=None, description="Details of the request parameters that failed validation.")
 
 
 def get_url_base(request: Request) -> str:
@@ -30,17 +44,44 @@ def get_url_base(request: Request) -> str:
     # If behind a proxy (and x-forwarded-* headers present), use the forwarded host and protocol
     host = (request.headers.get("x-forwarded-host") or request.headers.get("host", "")).split(",")[0].strip()
     proto = (request.headers.get("x-forwarded-proto") or request.url.scheme).split(",")[0].strip()
+    return _compose_url_base(proto, host)
+
+
+@functools.lru_cache(maxsize=16)
+def _compose_url_base(proto: str, host: str) -> str:
     return f"{proto}://{host}/problems"
 
 
+# Characters left as-is when quoting the instance URL ("%" is deliberately not safe, so existing escapes are re-encoded).
+# The tables delete every character quote() would keep, so an empty translate() result means nothing needs quoting.
+_PATH_SAFE = "/:@&+$,;=-._~"
+_QUERY_SAFE = "=&?/:@+$,;=-._~"
+_PATH_SAFE_TABLE = str.maketrans("", "", string.ascii_letters + string.digits + _PATH_SAFE)
+_QUERY_SAFE_TABLE = str.maketrans("", "", string.ascii_letters + string.digits + _QUERY_SAFE)
+
+
+def _quote_component(value: str, safe: str, safe_table: dict) -> str:
+    """quote() value, returning it unchanged when it has no characters to encode."""
+    if not value.translate(safe_table):
+        return value
+    return quote(value, safe=safe)
+
+
 def safe_instance_url(request: Request) -> str:
     """Return a URL-safe version of the request URL for the 'instance' field."""
-    parts = urlsplit(str(request.url))
+    url = str(request.url)
+    # Common case: nothing to encode anywhere (the query safe set is a superset of the path one and excludes "#"),
+    # so the URL is returned as-is; a trailing "?" would be dropped by urlunsplit, so that takes the slow path.
+    if not url.translate(_QUERY_SAFE_TABLE) and not url.endswith("?"):
+        return url
+
+    # Starlette's URL already holds (and caches) the split components, so don't re-parse the string
+    parts = request.url.components
 
     # Encode unsafe characters in each component
-    safe_path = quote(parts.path, safe="/:@&+$,;=-._~")
-    safe_query = quote(parts.query, safe="=&?/:@+$,;=-._~")
-    safe_fragment = quote(parts.fragment, safe="=&?/:@+$,;=-._~")
+    safe_path = _quote_component(parts.path, _PATH_SAFE, _PATH_SAFE_TABLE)
+    safe_query = _quote_component(parts.query, _QUERY_SAFE, _QUERY_SAFE_TABLE)
+    safe_fragment = _quote_component(parts.fragment, _QUERY_SAFE, _QUERY_SAFE_TABLE)
 
     return urlunsplit((parts.scheme, parts.netloc, safe_path, safe_query, safe_fragment))
 
@@ -67,19 +108,59 @@ def problem_response(*, request: Request, status: int, title, detail, problem_ty
         else:
             detail = str(detail)
 
-    body = {
-        "type": f"{url_base}/{problem_type}",
-        "title": title,
-        "status": status,
-        "detail": detail,
-        "instance": instance,
-    }
+    body = _problem_body(_problem_prefix(url_base, problem_type, status, title), detail, instance, invalid_params)
+    headers = extra_headers or {}
+    return Response(status_code=status, content=body, headers=headers, media_type="application/problem+json")
 
+
+def _problem_body(prefix: bytes, detail: str, instance: str, invalid_params: list[dict]|None) -> bytes:
+    """Fill a cached problem body template; only the per-occurrence members are encoded here."""
+    detail_part = _DETAIL_PARTS.get(detail) or b',"detail":' + orjson.dumps(detail)
+    parts = [prefix, detail_part, b',"instance":', orjson.dumps(instance)]
     if invalid_params:
-        body["invalid_params"] = invalid_params
+        parts += (b',"invalid_params":', orjson.dumps(invalid_params))
+    parts.append(b"}")
+    return b"".join(parts)
+
+
+@functools.lru_cache(maxsize=256)
+def _problem_prefix(url_base: str, problem_type: str, status: int, title: str) -> bytes:
+    """
+    Pre-encode the static leading part of a problem body (everything up to "detail").
+    Only "detail", "instance" and "invalid_params" change between occurrences of the same problem.
+    """
+    return orjson.dumps({"type": f"{url_base}/{problem_type}", "status": status, "title": title})[:-1]
+
+
+# status code -> (title, default detail, problem type, extra headers) for HTTP exceptions
+_STATUS_PROBLEMS = {
+    401: ("Unauthorized", "Bearer token is missing or invalid.", "unauthorized", {"WWW-Authenticate": "Bearer"}),
+    403: ("Forbidden", "Caller is authenticated but lacks required role.", "forbidden", None),
+    404: ("Not Found", "Invalid resource identifier.", "not-found", None),
+    405: ("Method Not Allowed", "HTTP method is not allowed for this resource.", "method-not-allowed", {"Allow": "GET, HEAD"}),
+    409: ("Conflict", "Conflict occurred.", "conflict", None),
+}
+_GENERIC_PROBLEM = ("Error", "An error occurred.", "generic-error", None)
+_INTERNAL_ERROR_DETAIL = "An unexpected error occurred."
+
+# Pre-encoded '"detail":...' members for the fixed default details, so the common cases skip encoding entirely
+_DETAIL_PARTS = {
+    detail: b',"detail":' + orjson.dumps(detail)
+    for detail in [entry[1] for entry in (*_STATUS_PROBLEMS.values(), _GENERIC_PROBLEM)] + [_INTERNAL_ERROR_DETAIL]
+}
 
-    headers = extra_headers or {}
-    return JSONResponse(status_code=status, content=Problem(**body).model_dump(), headers=headers, media_type="application/problem+json")
+
+def _status_problem_response(request: Request, status: int, err_msg):
+    """Return the problem response for an HTTP exception with the given status code."""
+    title, default_detail, problem_type, extra_headers = _STATUS_PROBLEMS.get(status, _GENERIC_PROBLEM)
+    return problem_response(
+        request=request,
+        status=status,
+        title=title,
+        detail=err_msg or default_detail,
+        problem_type=problem_type,
+        extra_headers=extra_headers,
+    )
 
 
 def install_error_handlers(app: FastAPI):
@@ -88,14 +169,8 @@ def install_error_handlers(app: FastAPI):
     # 400 — VALIDATION ERRORS
     @app.exception_handler(RequestValidationError)
     async def validation_error_handler(request: Request, exc: RequestValidationError):
-        invalid_params = []
-
-        for err in exc.errors():
-            name = str((err.get("loc") or ["unknown"])[-1])
-            reason = err.get("msg", "Invalid parameter")
-            invalid_params.append({"name": name, "reason": reason})
-
-        detail = ", ".join(ip["reason"] for ip in invalid_params)
+        invalid_params = [{"name": str(loc[-1]) if (loc := err.get("loc")) else "unknown", "reason": err.get("msg", "Invalid parameter")} for err in exc.errors()]
+        detail = ", ".join([ip["reason"] for ip in invalid_params])
 
         return problem_response(
             request=request,
@@ -109,112 +184,29 @@ def install_error_handlers(app: FastAPI):
     # FASTAPI HTTP EXCEPTIONS
     @app.exception_handler(HTTPException)
     async def http_exception_handler(request: Request, exc: HTTPException):
-        err_msg = ""
-        if hasattr(exc, "detail") and exc.detail:
-            err_msg = exc.detail
+        err_msg = exc.detail or ""
 
         if exc.status_code == 304:
             return Response(status_code=304, headers=exc.headers or {})
 
-        if exc.status_code == 401:
-            return problem_response(
-                request=request,
-                status=401,
-                title="Unauthorized",
-                detail=err_msg or "Bearer token is missing or invalid.",
-                problem_type="unauthorized",
-                extra_headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        if exc.status_code == 403:
-            return problem_response(
-                request=request,
-                status=403,
-                title="Forbidden",
-                detail=err_msg or "Caller is authenticated but lacks required role.",
-                problem_type="forbidden",
-            )
-
-        if exc.status_code == 404:
-            return problem_response(
-                request=request,
-                status=404,
-                title="Not Found",
-                detail=err_msg or "Invalid resource identifier.",
-                problem_type="not-found",
-            )
-
-        if exc.status_code == 405:
-            return problem_response(
-                request=request,
-                status=405,
-                title="Method Not Allowed",
-                detail=err_msg or "HTTP method is not allowed for this resource.",
-                problem_type="method-not-allowed",
-                extra_headers={"Allow": "GET, HEAD"},
-            )
-
-        if exc.status_code == 409:
-            return problem_response(
-                request=request,
-                status=409,
-                title="Conflict",
-                detail=err_msg or "Conflict occurred.",
-                problem_type="conflict",
-            )
-
-        # Generic fallback
-        return problem_response(
-            request=request,
-            status=exc.status_code,
-            title="Error",
-            detail=err_msg or "An error occurred.",
-            problem_type="generic-error",
-        )
+        return _status_problem_response(request, exc.status_code, err_msg)
 
     # STARLETTE HTTP EXCEPTIONS
     @app.exception_handler(StarletteHTTPException)
     async def starlette_handler(request: Request, exc: StarletteHTTPException):
-        err_msg = ""
-        if hasattr(exc, "detail") and exc.detail:
-            err_msg = exc.detail
-
-        if exc.status_code == 404:
-            return problem_response(
-                request=request,
-                status=404,
-                title="Not Found",
-                detail=err_msg or "Invalid resource identifier.",
-                problem_type="not-found",
-            )
-
-        if exc.status_code == 405:
-            return problem_response(
-                request=request,
-                status=405,
-                title="Method Not Allowed",
-                detail=err_msg or "HTTP method is not allowed for this resource.",
-                problem_type="method-not-allowed",
-                extra_headers={"Allow": "GET, HEAD"},
-            )
+        err_msg = exc.detail or ""
 
-        return problem_response(
-            request=request,
-            status=exc.status_code,
-            title="Error",
-            detail=err_msg or "An error occurred.",
-            problem_type="generic-error",
-        )
+        return _status_problem_response(request, exc.status_code, err_msg)
 
     # 500 — UNHANDLED EXCEPTIONS
     @app.exception_handler(Exception)
     async def global_handler(request: Request, exc: Exception):
-        logging.getLogger().exception(exc)
+        log.exception("Unhandled exception: %s", exc, exc_info=exc)
         return problem_response(
             request=request,
             status=500,
             title="Internal Server Error",
-            detail="An unexpected error occurred.",
+            detail=_INTERNAL_ERROR_DETAIL,
             problem_type="internal-error",
         )
 
@@ -303,7 +295,11 @@ EXAMPLE_504 = {
     "instance": f"/{config.API_URL}/status/resources",
 }
 
-DEFAULT_RESPONSES = {
+_STRING_SCHEMA = {"type": "string"}
+
+# Read-only mapping; the per-status entries (and anything nested in them) stay plain dicts because
+# FastAPI requires dict response entries and merges nested dicts into the OpenAPI document.
+DEFAULT_RESPONSES = MappingProxyType({
     400: {
         "description": "Invalid request parameters",
         "model": Problem,
@@ -313,11 +309,10 @@ DEFAULT_RESPONSES = {
         "headers": {
             "WWW-Authenticate": {
                 "description": "Bearer authentication challenge",
-                "schema": {"type": "string"},
+                "schema": _STRING_SCHEMA,
             }
         },
         "model": Problem,
-
     },
     403: {
         "description": "Forbidden",
@@ -332,7 +327,7 @@ DEFAULT_RESPONSES = {
         "headers": {
             "Allow": {
                 "description": "Allowed HTTP methods",
-                "schema": {"type": "string"},
+                "schema": _STRING_SCHEMA,
             }
         },
         "model": Problem,
@@ -362,4 +357,4 @@ DEFAULT_RESPONSES = {
         "model": Problem,
     },
     304: {"description": "Not Modified"},
-}
\ No newline at end of file
+})
\ No newline at end of file
@@ -26,16 +26,16 @@ class Site(NamedObject):
     @property
     def resource_uris(self) -> list[str]:
         """Return the list of resource URIs for this site."""
-        return [f"{get_url_prefix()}/status/resources/{resource_id}" for resource_id in self.resource_ids]
+        # The prefix is per request, so resolve it once per call rather than once per element
+        base = f"{get_url_prefix()}/status/resources/"
+        return [base + resource_id for resource_id in self.resource_ids]
 
     @classmethod
     def find(cls, items, name=None, description=None, modified_since=None, short_name=None, country_name=None):
         """Find Locations matching the given criteria."""
         items = super().find(items, name=name, description=description, modified_since=modified_since)
-        if short_name:
-            items = [item for item in items if item.short_name == short_name]
-        if country_name:
-            items = [item for item in items if item.country_name == country_name]
+        if short_name or country_name:
+            items = [item for item in items if (not short_name or item.short_name == short_name) and (not country_name or item.country_name == country_name)]
         return items
 
 
@@ -53,4 +53,5 @@ class Facility(NamedObject):
     @property
     def site_uris(self) -> list[str]:
         """Return the list of site URIs for this facility."""
-        return [f"{get_url_prefix()}/facility/sites/{site_id}" for site_id in self.site_ids]
+        base = f"{get_url_prefix()}/facility/sites/"
+        return [base + site_id for site_id in self.site_ids]
@@ -4,8 +4,11 @@
 #
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
+import asyncio
 import base64
+import time
 from fastapi import Depends, HTTPException, status, Request, File, UploadFile
+from fastapi.security import HTTPAuthorizationCredentials
 from ...types.http import forbidExtraQueryParams
 from ...types.user import User
 from .. import iri_router
@@ -22,6 +25,7 @@ router = iri_router.IriRouter(
     prefix="/filesystem",
     tags=["filesystem"],
 )
+_ROUTER_NAME = router.get_router_name()
 
 
 @router.post(
@@ -40,14 +44,100 @@ async def post_resources(
     return await status_router.adapter.get_resources_for_endpoint(status_models.Endpoint.filesystem)
 
 
+RESOURCE_CACHE_TTL_SECS = 30
+RESOURCE_CACHE_SIZE = 4096
+# How long an unknown resource_id keeps answering 404 without asking the adapter (and so how long a new resource may stay invisible)
+RESOURCE_NEGATIVE_TTL_SECS = 5
+# resource_id -> (expiry, resource or None if not found): clients tend to issue many filesystem calls against the same resource
+_resource_cache: dict[str, tuple[float, status_models.Resource | None]] = {}
+# resource_id -> lookup in flight: concurrent misses for one resource share a single adapter call
+_resource_inflight: dict[str, asyncio.Task] = {}
+
+
+def _cached_resource(resource_id: str, now: float) -> tuple[float, status_models.Resource | None] | None:
+    cached = _resource_cache.get(resource_id)
+    return cached if cached is not None and cached[0] > now else None
+
+
+async def _fetch_resource(resource_id: str) -> status_models.Resource | None:
+    """Ask the adapter for a resource; concurrent misses for one resource share a single adapter call. Nothing is cached here."""
+    task = _resource_inflight.get(resource_id)
+    if task is None:
+        task = asyncio.ensure_future(status_router.adapter.get_resource(resource_id))
+        _resource_inflight[resource_id] = task
+        task.add_done_callback(lambda _: _resource_inflight.pop(resource_id, None))
+    # shield: a cancelled request must not cancel the lookup other requests are waiting on
+    return await asyncio.shield(task) or None
+
+
+def _store_resource(resource_id: str, resource: status_models.Resource | None, now: float) -> None:
+    # Re-insert so the entry moves to the end of the eviction order
+    _resource_cache.pop(resource_id, None)
+    if len(_resource_cache) >= RESOURCE_CACHE_SIZE:
+        # Evict the oldest insertion
+        del _resource_cache[next(iter(_resource_cache))]
+    _resource_cache[resource_id] = (now + (RESOURCE_CACHE_TTL_SECS if resource else RESOURCE_NEGATIVE_TTL_SECS), resource)
+
+
 async def _user_resource(
     resource_id: str,
-    user: User,
-) -> status_models.Resource:
-    resource = await status_router.adapter.get_resource(resource_id)
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(iri_router.bearer_scheme),
+) -> tuple[User, status_models.Resource]:
+    """
+    Authenticate the caller and resolve the endpoint's `resource_id`. On a resource cache miss the adapter lookup
+    runs concurrently with authentication, but its result is only cached once the caller is authenticated:
+    unauthenticated requests can neither fill nor evict the resource cache, and their lookup is cancelled.
+    """
+    now = time.monotonic()
+    cached = _cached_resource(resource_id, now)
+    if cached is not None:
+        user = await router.current_user(request, credentials)
+        resource = cached[1]
+    else:
+        lookup = asyncio.ensure_future(_fetch_resource(resource_id))
+        try:
+            user = await router.current_user(request, credentials)
+        except BaseException:
+            lookup.cancel()
+            # Retrieve a lookup failure that raced the cancel, so it is not reported as never retrieved
+            lookup.add_done_callback(lambda t: t.cancelled() or t.exception())
+            raise
+        resource = await lookup
+        _store_resource(resource_id, resource, now)
     if not resource:
         raise HTTPException(status_code=404, detail="Resource not found")
-    return resource
+    return user, resource
+
+
+# Handlers depend on these two; FastAPI resolves `_user_resource` once per request for both
+async def _user(user_resource: tuple[User, status_models.Resource] = Depends(_user_resource)) -> User:
+    return user_resource[0]
+
+
+async def _resource(user_resource: tuple[User, status_models.Resource] = Depends(_user_resource)) -> status_models.Resource:
+    return user_resource[1]
+
+
+def _task_command(command: str, args: dict) -> task_models.TaskCommand:
+    """Build the task for a handler: every field is set by the handler itself, so pydantic validation is skipped."""
+    return task_models.TaskCommand.model_construct(router=_ROUTER_NAME, command=command, args=args)
+
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def _read_upload(file: UploadFile, limit: int) -> bytearray:
+    """Read an uploaded file in chunks, failing with 413 as soon as it exceeds limit bytes."""
+    if file.size is not None and file.size > limit:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File to upload is too large.")
+
+    content = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        content += chunk
+        if len(content) > limit:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File to upload is too large.")
+    return content
 
 
 @router.post(
@@ -64,17 +154,13 @@ async def post_chmod(
     resource_id: str,
     request_model: models.PutFileChmodRequest,
     request: Request,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
-    resource = await _user_resource(resource_id, user)
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="chmod",
-            args={"request_model": request_model},
-        ),
+        task=_task_command("chmod", {"request_model": request_model}),
     )
 
 
@@ -92,17 +178,13 @@ async def post_chown(
     resource_id: str,
     request_model: models.PutFileChownRequest,
     request: Request,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
-    resource = await _user_resource(resource_id, user)
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="chown",
-            args={"request_model": request_model},
-        ),
+        task=_task_command("chown", {"request_model": request_model}),
     )
 
 
@@ -120,17 +202,13 @@ async def post_file(
     resource_id: str,
     request_model: models.PostFileRequest,
     request: Request,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
-    resource = await _user_resource(resource_id, user)
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="file",
-            args={"path": request_model.path},
-        ),
+        task=_task_command("file", {"path": request_model.path}),
     )
 
 
@@ -148,17 +226,13 @@ async def post_stat(
     resource_id: str,
     request_model: models.PostStatRequest,
     request: Request,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
-    resource = await _user_resource(resource_id, user)
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="stat",
-            args={"path": request_model.path, "dereference": request_model.dereference},
-        ),
+        task=_task_command("stat", {"path": request_model.path, "dereference": request_model.dereference}),
     )
 
 
@@ -176,17 +250,13 @@ async def post_mkdir(
     resource_id: str,
     request: Request,
     request_model: models.PostMakeDirRequest,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
-    resource = await _user_resource(resource_id, user)
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="mkdir",
-            args={"request_model": request_model},
-        ),
+        task=_task_command("mkdir", {"request_model": request_model}),
     )
 
 
@@ -204,17 +274,13 @@ async def post_symlink(
     resource_id: str,
     request: Request,
     request_model: models.PostFileSymlinkRequest,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
-    resource = await _user_resource(resource_id, user)
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="symlink",
-            args={"request_model": request_model},
-        ),
+        task=_task_command("symlink", {"request_model": request_model}),
     )
 
 
@@ -233,23 +299,19 @@ async def post_ls(
     resource_id: str,
     request_model: models.PostLsRequest,
     request: Request,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
-    resource = await _user_resource(resource_id, user)
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="ls",
-            args={
-                "path": request_model.path,
-                "show_hidden": request_model.show_hidden,
-                "numeric_uid": request_model.numeric_uid,
-                "recursive": request_model.recursive,
-                "dereference": request_model.dereference,
-            },
-        ),
+        task=_task_command("ls", {
+            "path": request_model.path,
+            "show_hidden": request_model.show_hidden,
+            "numeric_uid": request_model.numeric_uid,
+            "recursive": request_model.recursive,
+            "dereference": request_model.dereference,
+        }),
     )
 
 
@@ -267,24 +329,20 @@ async def post_head(
     resource_id: str,
     request_model: models.PostHeadRequest,
     request: Request,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
     if (request_model.file_bytes is None and request_model.lines is None) or (request_model.file_bytes is not None and request_model.lines is not None):
         raise HTTPException(status_code=400, detail="Exactly one of `bytes` or `lines` must be specified.")
-    resource = await _user_resource(resource_id, user)
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="head",
-            args={
-                "path": request_model.path,
-                "file_bytes": request_model.file_bytes,
-                "lines": request_model.lines,
-                "skip_trailing": request_model.skip_trailing,
-            },
-        ),
+        task=_task_command("head", {
+            "path": request_model.path,
+            "file_bytes": request_model.file_bytes,
+            "lines": request_model.lines,
+            "skip_trailing": request_model.skip_trailing,
+        }),
     )
 
 
@@ -302,19 +360,16 @@ async def post_view(
     resource_id: str,
     request_model: models.PostViewRequest,
     request: Request,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
-    if request_model.size > facility_adapter.OPS_SIZE_LIMIT:
-        raise HTTPException(status_code=400, detail=f"Requested size exceeds limit of {facility_adapter.OPS_SIZE_LIMIT} bytes.")
-    resource = await _user_resource(resource_id, user)
+    limit = facility_adapter.OPS_SIZE_LIMIT
+    if request_model.size > limit:
+        raise HTTPException(status_code=400, detail=f"Requested size exceeds limit of {limit} bytes.")
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="view",
-            args={"path": request_model.path, "size": request_model.size, "offset": request_model.offset},
-        ),
+        task=_task_command("view", {"path": request_model.path, "size": request_model.size, "offset": request_model.offset}),
     )
 
 
@@ -332,24 +387,20 @@ async def post_tail(
     resource_id: str,
     request_model: models.PostTailRequest,
     request: Request,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
     if (request_model.file_bytes is None and request_model.lines is None) or (request_model.file_bytes is not None and request_model.lines is not None):
         raise HTTPException(status_code=400, detail="Exactly one of `bytes` or `lines` must be specified.")
-    resource = await _user_resource(resource_id, user)
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="tail",
-            args={
-                "path": request_model.path,
-                "file_bytes": request_model.file_bytes,
-                "lines": request_model.lines,
-                "skip_heading": request_model.skip_heading,
-            },
-        ),
+        task=_task_command("tail", {
+            "path": request_model.path,
+            "file_bytes": request_model.file_bytes,
+            "lines": request_model.lines,
+            "skip_heading": request_model.skip_heading,
+        }),
     )
 
 
@@ -367,17 +418,13 @@ async def post_checksum(
     resource_id: str,
     request_model: models.PostChecksumRequest,
     request: Request,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
-    resource = await _user_resource(resource_id, user)
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="checksum",
-            args={"path": request_model.path},
-        ),
+        task=_task_command("checksum", {"path": request_model.path}),
     )
 
 
@@ -395,17 +442,13 @@ async def post_rm(
     resource_id: str,
     request_model: models.PostRmRequest,
     request: Request,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
-    resource = await _user_resource(resource_id, user)
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="rm",
-            args={"path": request_model.path},
-        ),
+        task=_task_command("rm", {"path": request_model.path}),
     )
 
 
@@ -423,17 +466,13 @@ async def post_compress(
     resource_id: str,
     request: Request,
     request_model: models.PostCompressRequest,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
-    resource = await _user_resource(resource_id, user)
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="compress",
-            args={"request_model": request_model},
-        ),
+        task=_task_command("compress", {"request_model": request_model}),
     )
 
 
@@ -451,17 +490,13 @@ async def post_extract(
     resource_id: str,
     request: Request,
     request_model: models.PostExtractRequest,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
-    resource = await _user_resource(resource_id, user)
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="extract",
-            args={"request_model": request_model},
-        ),
+        task=_task_command("extract", {"request_model": request_model}),
     )
 
 
@@ -479,17 +514,13 @@ async def post_mv(
     resource_id: str,
     request: Request,
     request_model: models.PostMoveRequest,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
-    resource = await _user_resource(resource_id, user)
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="mv",
-            args={"request_model": request_model},
-        ),
+        task=_task_command("mv", {"request_model": request_model}),
     )
 
 
@@ -507,17 +538,13 @@ async def post_cp(
     resource_id: str,
     request: Request,
     request_model: models.PostCopyRequest,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
-    resource = await _user_resource(resource_id, user)
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="cp",
-            args={"request_model": request_model},
-        ),
+        task=_task_command("cp", {"request_model": request_model}),
     )
 
 
@@ -535,17 +562,13 @@ async def post_download(
     resource_id: str,
     request_model: models.PostDownloadRequest,
     request: Request,
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
-    resource = await _user_resource(resource_id, user)
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="download",
-            args={"path": request_model.path},
-        ),
+        task=_task_command("download", {"path": request_model.path}),
     )
 
 
@@ -564,26 +587,16 @@ async def post_upload(
     request: Request,
     path: str,
     file: UploadFile = File(description="File to be uploaded as `multipart/form-data`"),
-    user: User = Depends(router.current_user),
+    user: User = Depends(_user),
+    resource: status_models.Resource = Depends(_resource),
 ) -> task_models.TaskSubmitResponse:
-    resource = await _user_resource(resource_id, user)
-    raw_content = file.file.read()
-
-    if len(raw_content) > facility_adapter.OPS_SIZE_LIMIT:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail="File to upload is too large.",
-        )
+    raw_content = await _read_upload(file, facility_adapter.OPS_SIZE_LIMIT)
 
     return await router.task_adapter.put_task(
         user=user,
         resource=resource,
-        task=task_models.TaskCommand(
-            router=router.get_router_name(),
-            command="upload",
-            args={
-                "path": path,
-                "content": base64.b64encode(raw_content).decode("utf-8"),
-            },
-        ),
+        task=_task_command("upload", {
+            "path": path,
+            "content": base64.b64encode(raw_content).decode("utf-8"),
+        }),
     )
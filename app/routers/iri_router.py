@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+import asyncio
+import functools
 import os
 import logging
 import importlib
@@ -12,45 +14,74 @@ from ..request_context import get_iri_facility_project
 from ..types.user import User
 
 bearer_scheme = HTTPBearer()
+log = logging.getLogger(__name__)
 
 
 GLOBUS_RS_ID = os.environ.get("GLOBUS_RS_ID")
 GLOBUS_RS_SECRET = os.environ.get("GLOBUS_RS_SECRET")
 GLOBUS_RS_SCOPE_SUFFIX = os.environ.get("GLOBUS_RS_SCOPE_SUFFIX")
+IRI_SHOW_MISSING_ROUTES = os.environ.get("IRI_SHOW_MISSING_ROUTES") in ["true", "1", "on", "yes"]
+
+# A verified token is trusted for this long (or until its own `exp`, if sooner) before it is checked again,
+# so a revoked token keeps working for up to this many seconds; 0 checks every request
+AUTH_CACHE_TTL_SECS = int(os.environ.get("IRI_AUTH_CACHE_TTL_SECS") or 60)
+AUTH_CACHE_SIZE = 8192
+USER_CACHE_TTL_SECS = 30
+USER_CACHE_SIZE = 4096
+# How long a token whose user is unknown keeps answering 404 without asking the adapter (and so how long a new user may wait)
+USER_NEGATIVE_TTL_SECS = 5
+
+
+@functools.cache
+def _globus_auth_client() -> globus_sdk.ConfidentialAppAuthClient:
+    """One Globus Auth client per process, so introspection calls reuse its pooled HTTPS connections."""
+    return globus_sdk.ConfidentialAppAuthClient(GLOBUS_RS_ID, GLOBUS_RS_SECRET)
+
+
+# Client address headers in order of precedence (ASGI header names are lower-case bytes)
+_CLIENT_IP_HEADERS = (b"x-forwarded-for", b"http_x_real_ip", b"x-real-ip")
 
 
 def get_client_ip(request: Request) -> str | None:
-    forwarded_for = request.headers.get("X-Forwarded-For")
+    # One pass over the raw ASGI headers instead of a Headers lookup (itself a scan) per candidate name
+    found = {}
+    for name, value in request.scope["headers"]:
+        if name in _CLIENT_IP_HEADERS and name not in found:
+            found[name] = value
+    forwarded_for = found.get(b"x-forwarded-for")
     if forwarded_for:
-        return forwarded_for.split(",")[0].strip()
-    else:
-        ip_addr = request.headers.get("HTTP_X_REAL_IP")
-        if not ip_addr:
-            ip_addr = request.headers.get("x-real-ip")
-            if not ip_addr:
-                ip_addr = request.client.host
-        return ip_addr
+        return forwarded_for.decode("latin-1").split(",")[0].strip()
+    ip_addr = found.get(b"http_x_real_ip") or found.get(b"x-real-ip")
+    if ip_addr:
+        return ip_addr.decode("latin-1")
+    return request.client.host
 
 
 class IriRouter(APIRouter):
     def __init__(self, router_adapter=None, task_router_adapter=None, **kwargs):
         super().__init__(**kwargs)
-        router_name = self.get_router_name()
+        router_name = self._router_name = self.prefix.replace("/", "").strip()
+        # (api_key, client_ip) -> (expiry as epoch seconds, user_id, globus_introspect): successful authentications only
+        self._auth_cache: dict[tuple[str, str | None], tuple[float, str, dict | None]] = {}
+        # (user_id, api_key, client_ip) -> (expiry, user or None if not found): the user profile lookup that follows authentication
+        self._user_cache: dict[tuple[str, str, str | None], tuple[float, User | None]] = {}
+        # Lookups in flight for the same key: concurrent requests await one adapter call instead of each making their own
+        self._user_inflight: dict[tuple[str, str, str | None], asyncio.Task] = {}
         self.adapter = IriRouter.create_adapter(router_name, router_adapter)
         if self.adapter:
-            logging.getLogger().info(f"Successfully loaded {router_name} adapter: {self.adapter.__class__.__name__}")
+            log.info("Successfully loaded %s adapter: %s", router_name, self.adapter.__class__.__name__)
         else:
-            logging.getLogger().info(f"Hiding {router_name}")
+            log.info("Hiding %s", router_name)
             self.include_in_schema = False
         self.task_adapter = None
         if task_router_adapter:
             self.task_adapter = IriRouter.create_adapter("task", task_router_adapter)
             if not self.task_adapter:
-                logging.getLogger().info(f'Hiding {router_name} because "task" adapter was not found')
+                log.info('Hiding %s because "task" adapter was not found', router_name)
                 self.include_in_schema = False
 
     def get_router_name(self):
-        return self.prefix.replace("/", "").strip()
+        return self._router_name
 
     @staticmethod
     def _get_adapter_name(router_name: str) -> str | None:
@@ -59,7 +90,7 @@ class IriRouter(APIRouter):
         # and IRI_SHOW_MISSING_ROUTES is not true,
         # hide the router
         env_var = f"IRI_API_ADAPTER_{router_name}"
-        if env_var not in os.environ and os.environ.get("IRI_SHOW_MISSING_ROUTES") not in ["true", "1", "on", "yes"]:
+        if env_var not in os.environ and not IRI_SHOW_MISSING_ROUTES:
             return None
 
         # find and load the actual implementation
@@ -72,24 +103,29 @@ class IriRouter(APIRouter):
         if not adapter_name:
             return None
 
+        # assign it
+        return IriRouter._resolve_adapter_class(adapter_name, router_adapter)()
+
+    @staticmethod
+    @functools.cache
+    def _resolve_adapter_class(adapter_name: str, router_adapter: type) -> type:
+        """Import the adapter class named by `adapter_name` (once per name) and check it implements `router_adapter`."""
         parts = adapter_name.rsplit(".", 1)
         module = importlib.import_module(parts[0])
         AdapterClass = getattr(module, parts[1])
         if not issubclass(AdapterClass, router_adapter):
             raise Exception(f"{adapter_name} should implement FacilityAdapter")
-
-        # assign it
-        return AdapterClass()
+        return AdapterClass
 
 
     async def get_globus_info(self, api_key: str) -> dict:
         """Returns the linked identities and the session info objects"""
         # Introspect the IRI API token using resource server credentials
-        globus_client = globus_sdk.ConfidentialAppAuthClient(GLOBUS_RS_ID, GLOBUS_RS_SECRET)
+        globus_client = _globus_auth_client()
         # grab identity_set_detail for linked identities and session_info to see how the user logged in
         introspect = globus_client.oauth2_token_introspect(api_key, include="identity_set_detail,session_info")
-        logging.getLogger().info("IRI TOKEN INTROSPECTION:")
-        logging.getLogger().info(introspect)
+        log.info("IRI TOKEN INTROSPECTION:")
+        log.info("%s", introspect)
         if not introspect.get("active"):
             raise Exception("Inactive token")
 
@@ -128,8 +164,34 @@ class IriRouter(APIRouter):
         request: Request,
         credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
     ):
+        # Already resolved for this request (e.g. by another dependency that calls current_user directly)
+        user = getattr(request.state, "iri_user", None)
+        if user is not None:
+            return user
         token = credentials.credentials
         ip_address = get_client_ip(request)
+        key = (token, ip_address)
+        now = time.time()
+        cached = self._auth_cache.get(key)
+        if cached is not None and cached[0] > now:
+            _, user_id, globus_introspect = cached
+        else:
+            user_id, globus_introspect = await self._authenticate(token, ip_address)
+            if AUTH_CACHE_TTL_SECS > 0:
+                expiry = now + AUTH_CACHE_TTL_SECS
+                if globus_introspect and globus_introspect.get("exp"):
+                    expiry = min(expiry, globus_introspect["exp"])
+                self._auth_cache.pop(key, None)
+                if len(self._auth_cache) >= AUTH_CACHE_SIZE:
+                    # Evict the oldest insertion
+                    del self._auth_cache[next(iter(self._auth_cache))]
+                self._auth_cache[key] = (expiry, user_id, globus_introspect)
+
+        user = request.state.iri_user = await self._get_user(user_id, token, ip_address, globus_introspect)
+        return user
+
+    async def _authenticate(self, token: str, ip_address: str | None) -> tuple[str, dict | None]:
+        """Verify the token (Globus introspection first, if configured, then the facility adapter) and return the user id."""
         user_id = None
         globus_introspect = None
         exc_msg = ""
@@ -139,24 +201,46 @@ class IriRouter(APIRouter):
                     globus_introspect = await self.get_globus_info(token)
                     user_id = await self.adapter.get_current_user_globus(token, ip_address, globus_introspect)
                 except Exception as globus_exc:
-                    logging.getLogger().exception("Globus error:", exc_info=globus_exc)
+                    log.warning("Globus error: %s", globus_exc, exc_info=log.isEnabledFor(logging.DEBUG))
                     exc_msg = f"Globus authentication failed: {str(globus_exc)}. || "
             if not user_id:
                 user_id = await self.adapter.get_current_user(token, ip_address)
         except Exception as exc:
-            logging.getLogger().exception("Facility Specific auth failed: ", exc_info=exc)
+            # Rejected tokens are routine (and attacker-driven): one line each, with the traceback only when debugging
+            log.warning("Facility Specific auth failed: %s", exc, exc_info=log.isEnabledFor(logging.DEBUG))
             exc_msg += f"Facility Specific authentication failed: {str(exc)}"
             raise HTTPException(status_code=401, detail=exc_msg) from exc
         if not user_id:
             raise HTTPException(status_code=403, detail="Authentication succeeded but no user ID was identified. Contact Facility Admin.")
-
-        user = await self.adapter.get_user(
-            user_id=user_id,
-            api_key=token,
-            client_ip=ip_address,
-            globus_introspect=globus_introspect,
-        )
-
+        return user_id, globus_introspect
+
+    async def _get_user(self, user_id: str, api_key: str, client_ip: str | None, globus_introspect: dict | None) -> User:
+        key = (user_id, api_key, client_ip)
+        now = time.monotonic()
+        cached = self._user_cache.get(key)
+        if cached is not None and cached[0] > now:
+            if cached[1] is None:
+                raise HTTPException(status_code=404, detail="User not found")
+            return cached[1]
+        task = self._user_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.adapter.get_user(
+                user_id=user_id,
+                api_key=api_key,
+                client_ip=client_ip,
+                globus_introspect=globus_introspect,
+            ))
+            self._user_inflight[key] = task
+            task.add_done_callback(lambda _: self._user_inflight.pop(key, None))
+        # shield: a cancelled request must not cancel the lookup other requests are waiting on
+        user = await asyncio.shield(task) or None
+
+        # Re-insert so the entry moves to the end of the eviction order
+        self._user_cache.pop(key, None)
+        if len(self._user_cache) >= USER_CACHE_SIZE:
+            # Evict the oldest insertion
+            del self._user_cache[next(iter(self._user_cache))]
+        self._user_cache[key] = (now + (USER_CACHE_TTL_SECS if user else USER_NEGATIVE_TTL_SECS), user)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         return user
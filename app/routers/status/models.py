@@ -7,6 +7,13 @@ from pydantic import Field, computed_field, field_validator
 from ...request_context import get_url_prefix
 from ...types.base import NamedObject
 
+# API paths the URIs below are built from; only the per-request URL prefix is prepended at serialization time
+_SITES_PATH = "/facility/sites/"
+_CAPABILITIES_PATH = "/account/capabilities/"
+_RESOURCES_PATH = "/status/resources/"
+_EVENTS_PATH = "/status/events/"
+_INCIDENTS_PATH = "/status/incidents/"
+
 
 class Status(enum.Enum):
     """Represents the status of a resource."""
@@ -36,7 +43,7 @@ class Resource(NamedObject):
     """Represents a resource in the system."""
     def _self_path(self) -> str:
         """Return the API path for this resource."""
-        return f"/status/resources/{self.id}"
+        return _RESOURCES_PATH + self.id
 
     site_id: str = Field(..., description="The site identifier this resource is located at", exclude=True, example="site-1")
     capability_ids: list[str] = Field(default_factory=list, exclude=True)
@@ -49,37 +56,40 @@ class Resource(NamedObject):
     @property
     def site_uri(self) -> str:
         """Return the site URI for this resource."""
-        return f"{get_url_prefix()}/facility/sites/{self.site_id}"
+        return get_url_prefix() + _SITES_PATH + self.site_id
 
     @computed_field(description="The list of capabilities in this resource")
     @property
     def capability_uris(self) -> list[str]:
         """Return the list of capability URIs for this resource."""
-        return [f"{get_url_prefix()}/account/capabilities/{e}" for e in self.capability_ids]
+        return self._uri_list(_CAPABILITIES_PATH, self.capability_ids)
 
     @classmethod
-    def find(cls, items, name=None, description=None, modified_since=None, group=None, resource_type=None, current_status=None, capability=None, site_id=None) -> list:
-        items = super().find(items, name=name, description=description, modified_since=modified_since)
-        if group:
-            items = [item for item in items if item.group == group]
-        if resource_type:
-            if isinstance(resource_type, str):
-                resource_type = ResourceType(resource_type)
-            items = [item for item in items if item.resource_type == resource_type]
-        if current_status:
-            items = [item for item in items if item.current_status == current_status]
-        if capability:
-            items = [item for item in items if any(cap_id in item.capability_ids for cap_id in capability)]
-        if site_id:
-            items = [item for item in items if item.site_id == site_id]
-        return items
+    def find(cls, items, name=None, description=None, modified_since=None, group=None, resource_type=None, current_status=None, capability=None, site_id=None, offset=None, limit=None) -> list:
+        # One lazy pass over the items with every filter checked per item, stopping once the offset/limit window is filled
+        if not any((name, description, modified_since, group, resource_type, current_status, capability, site_id)):
+            return cls._page(items, offset, limit)
+        if resource_type and isinstance(resource_type, str):
+            resource_type = ResourceType(resource_type)
+        modified_since = cls.normalize_dt(modified_since) if modified_since else None
+        return cls._page((
+            item for item in items
+            if (not name or item.name == name)
+            and (not description or (item.description and description in item.description))
+            and (not modified_since or (item.last_modified and item.last_modified >= modified_since))
+            and (not group or item.group == group)
+            and (not resource_type or item.resource_type == resource_type)
+            and (not current_status or item.current_status == current_status)
+            and (not capability or any(cap_id in item.capability_ids for cap_id in capability))
+            and (not site_id or item.site_id == site_id)
+        ), offset, limit)
 
 
 class Event(NamedObject):
     """Represents an event that occurred to a resource, which may be part of an incident."""
     def _self_path(self) -> str:
         """Return the API path for this event."""
-        return f"/status/events/{self.id}"
+        return _EVENTS_PATH + self.id
 
     @field_validator("occurred_at", mode="before")
     @classmethod
@@ -95,38 +105,37 @@ class Event(NamedObject):
     @property
     def resource_uri(self) -> str:
         """Return the resource URI for this event."""
-        return f"{get_url_prefix()}/status/resources/{self.resource_id}"
+        return get_url_prefix() + _RESOURCES_PATH + self.resource_id
 
     @computed_field(description="The event's incident")
     @property
     def incident_uri(self) -> str | None:
         """Return the incident URI for this event."""
-        return f"{get_url_prefix()}/status/incidents/{self.incident_id}" if self.incident_id else None
+        return get_url_prefix() + _INCIDENTS_PATH + self.incident_id if self.incident_id else None
 
     @classmethod
-    def find(cls, items, incident_id=None, name=None, description=None, modified_since=None, resource_id=None, status=None, from_=None, to=None, time_=None) -> list:
-        items = super().find(items, name=name, description=description, modified_since=modified_since)
-
-        if incident_id:
-            items = [e for e in items if e.incident_id == incident_id]
-        if resource_id:
-            items = [e for e in items if e.resource_id == resource_id]
-        if status:
-            if isinstance(status, str):
-                status = Status(status)
-            items = [e for e in items if e.status == status]
-
+    def find(cls, items, incident_id=None, name=None, description=None, modified_since=None, resource_id=None, status=None, from_=None, to=None, time_=None, offset=None, limit=None) -> list:
+        if not any((incident_id, name, description, modified_since, resource_id, status, from_, to, time_)):
+            return cls._page(items, offset, limit)
+        if status and isinstance(status, str):
+            status = Status(status)
+        modified_since = cls.normalize_dt(modified_since) if modified_since else None
         from_ = cls.normalize_dt(from_) if from_ else None
         to = cls.normalize_dt(to) if to else None
         time_ = cls.normalize_dt(time_) if time_ else None
 
-        if from_:
-            items = [e for e in items if e.occurred_at >= from_]
-        if to:
-            items = [e for e in items if e.occurred_at < to]
-        if time_:
-            items = [e for e in items if e.occurred_at == time_]
-        return items
+        return cls._page((
+            e for e in items
+            if (not name or e.name == name)
+            and (not description or (e.description and description in e.description))
+            and (not modified_since or (e.last_modified and e.last_modified >= modified_since))
+            and (not incident_id or e.incident_id == incident_id)
+            and (not resource_id or e.resource_id == resource_id)
+            and (not status or e.status == status)
+            and (not from_ or e.occurred_at >= from_)
+            and (not to or e.occurred_at < to)
+            and (not time_ or e.occurred_at == time_)
+        ), offset, limit)
 
 
 class IncidentType(enum.Enum):
@@ -149,7 +158,7 @@ class Incident(NamedObject):
     """Represents an incident that may impact one or more resources."""
     def _self_path(self) -> str:
         """Return the API path for this incident."""
-        return f"/status/incidents/{self.id}"
+        return _INCIDENTS_PATH + self.id
 
     @field_validator("start", "end", mode="before")
     @classmethod
@@ -168,36 +177,33 @@ class Incident(NamedObject):
     @property
     def event_uris(self) -> list[str]:
         """Return the list of event URIs for this incident."""
-        return [f"{get_url_prefix()}/status/events/{e}" for e in self.event_ids]
+        return self._uri_list(_EVENTS_PATH, self.event_ids)
 
     @computed_field(description="The list of resources that may be impacted by this incident")
     @property
     def resource_uris(self) -> list[str]:
         """Return the list of resource URIs for this incident."""
-        return [f"{get_url_prefix()}/status/resources/{r}" for r in self.resource_ids]
+        return self._uri_list(_RESOURCES_PATH, self.resource_ids)
 
     @classmethod
-    def find(cls, items, name=None, description=None, modified_since=None, status=None, type_=None, from_=None, to=None, time_=None, resource_id=None, resolution=None) -> list:
-        items = super().find(items, name=name, description=description, modified_since=modified_since)
-
-        if resource_id:
-            items = [e for e in items if resource_id in e.resource_ids]
-        if status:
-            items = [e for e in items if e.status == status]
-        if type_:
-            items = [e for e in items if e.type == type_]
-        if resolution:
-            items = [e for e in items if e.resolution == resolution]
-
+    def find(cls, items, name=None, description=None, modified_since=None, status=None, type_=None, from_=None, to=None, time_=None, resource_id=None, resolution=None, offset=None, limit=None) -> list:
+        if not any((name, description, modified_since, status, type_, from_, to, time_, resource_id, resolution)):
+            return cls._page(items, offset, limit)
+        modified_since = cls.normalize_dt(modified_since) if modified_since else None
         from_ = cls.normalize_dt(from_) if from_ else None
         to = cls.normalize_dt(to) if to else None
         time_ = cls.normalize_dt(time_) if time_ else None
 
-        if from_:
-            items = [e for e in items if e.start >= from_]
-        if to:
-            items = [e for e in items if e.end and e.end < to]
-
-        if time_:
-            items = [e for e in items if e.start <= time_ and (e.end is None or e.end > time_)]
-        return items
+        return cls._page((
+            e for e in items
+            if (not name or e.name == name)
+            and (not description or (e.description and description in e.description))
+            and (not modified_since or (e.last_modified and e.last_modified >= modified_since))
+            and (not resource_id or resource_id in e.resource_ids)
+            and (not status or e.status == status)
+            and (not type_ or e.type == type_)
+            and (not resolution or e.resolution == resolution)
+            and (not from_ or e.start >= from_)
+            and (not to or (e.end and e.end < to))
+            and (not time_ or (e.start <= time_ and (e.end is None or e.end > time_)))
+        ), offset, limit)
@@ -1,8 +1,8 @@
 from typing import List
 
-from fastapi import Depends, HTTPException, Query, Request
+from fastapi import Depends, HTTPException, Query, Request, Response
 
-from ...types.http import forbidExtraQueryParams
+from ...types.http import forbidExtraQueryParams, model_response
 from ...types.scalars import AllocationUnit, StrictDateTime
 from .. import iri_router
 from ..error_handlers import DEFAULT_RESPONSES
@@ -20,9 +20,9 @@ router = iri_router.IriRouter(
     "/resources",
     summary="Get all resources",
     description="Get a list of all resources at this facility. You can optionally filter the returned list by specifying attribtes.",
-    responses=DEFAULT_RESPONSES,
+    responses={200: {"model": list[models.Resource]}, **DEFAULT_RESPONSES},
     operation_id="getResources",
-    response_model_exclude_none=True,
+    response_model=None,
     openapi_extra=iri_meta_dict("production", "required")
 )
 async def get_resources(
@@ -37,10 +37,11 @@ async def get_resources(
     current_status: models.Status = Query(default=None),
     capability: List[AllocationUnit] = Query(default=None, min_length=1),
     _forbid=Depends(forbidExtraQueryParams("name", "description", "group", "offset", "limit", "modified_since", "resource_type", "current_status", "capability", multiParams={"capability"})),
-) -> list[models.Resource]:
-    return await router.adapter.get_resources(
+) -> Response:
+    resources = await router.adapter.get_resources(
         offset=offset, limit=limit, name=name, description=description, group=group, modified_since=modified_since, resource_type=resource_type, current_status=current_status, capability=capability
     )
+    return model_response(list[models.Resource], resources)
 
 
 @router.get(
@@ -65,8 +66,9 @@ async def get_resource(
     "/incidents",
     summary="Get all incidents without their events",
     description="Get a list of all incidents. Each incident will be returned without its events.  You can optionally filter the returned list by specifying attributes.",
-    responses=DEFAULT_RESPONSES,
+    responses={200: {"model": list[models.Incident]}, **DEFAULT_RESPONSES},
     operation_id="getIncidents",
+    response_model=None,
     openapi_extra=iri_meta_dict("production", "required")
 )
 async def get_incidents(
@@ -102,7 +104,7 @@ async def get_incidents(
             multiParams={"resource_uris", "event_uris"},
         )
     ),
-) -> list[models.Incident]:
+) -> Response:
     incidents = await router.adapter.get_incidents(
         offset=offset,
         limit=limit,
@@ -119,7 +121,7 @@ async def get_incidents(
     )
     if not incidents:
         raise HTTPException(status_code=404, detail="No incidents found")
-    return incidents
+    return model_response(list[models.Incident], incidents, exclude_none=False)
 
 @router.get(
     "/incidents/{incident_id}",
@@ -140,8 +142,9 @@ async def get_incident(request: Request, incident_id: str) -> models.Incident:
     "/events",
     summary="Get all events",
     description="Get a list of all events.  You can optionally filter the returned list by specifying attribtes.",
-    responses=DEFAULT_RESPONSES,
+    responses={200: {"model": list[models.Event]}, **DEFAULT_RESPONSES},
     operation_id="getEventsByIncident",
+    response_model=None,
     openapi_extra=iri_meta_dict("production", "required")
 )
 async def get_events(
@@ -158,13 +161,13 @@ async def get_events(
     offset: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=0, le=1000),
     _forbid=Depends(forbidExtraQueryParams("incident_id", "resource_id", "name", "description", "status", "from", "to", "time", "modified_since", "offset", "limit")),
-) -> list[models.Event]:
+) -> Response:
     events = await router.adapter.get_events(
         incident_id=incident_id, offset=offset, limit=limit, resource_id=resource_id, name=name, description=description, status=status, from_=from_, to=to, time_=time_, modified_since=modified_since
     )
     if not events:
         raise HTTPException(status_code=404, detail="No events found")
-    return events
+    return model_response(list[models.Event], events, exclude_none=False)
 
 
 @router.get(
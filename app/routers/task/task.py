@@ -1,4 +1,5 @@
-from fastapi import Request, HTTPException, Depends
+from fastapi import Request, Response, HTTPException, Depends
+from ...types.http import model_response
 from ...types.user import User
 from .. import iri_router
 from ..error_handlers import DEFAULT_RESPONSES
@@ -14,8 +15,8 @@ router = iri_router.IriRouter(
 
 @router.get(
     "/{task_id:str}",
-    response_model_exclude_unset=True,
-    responses=DEFAULT_RESPONSES,
+    response_model=None,
+    responses={200: {"model": models.Task}, **DEFAULT_RESPONSES},
     operation_id="getTask",
     openapi_extra=iri_meta_dict("production", "required")
 )
@@ -23,12 +24,13 @@ async def get_task(
     request: Request,
     task_id: str,
     user: User = Depends(router.current_user)
-) -> models.Task:
+) -> Response:
     """Get a task"""
     task = await router.adapter.get_task(user=user, task_id=task_id)
     if not task:
         raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
-    return task
+    # Task results (e.g. a recursive ls) can be large: serialize them straight to JSON bytes
+    return model_response(models.Task, task, exclude_none=False, exclude_unset=True)
 
 
 @router.get("",
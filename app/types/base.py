@@ -1,8 +1,10 @@
 """Default models used by multiple routers."""
 import datetime
+import itertools
+import warnings
 from collections.abc import Iterable
 
-from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator, model_serializer
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
 
 from .. import config
 from ..request_context import get_url_prefix
@@ -10,25 +12,24 @@ from .scalars import StrictDateTime
 
 
 class IRIBaseModel(BaseModel):
-    """Base model for IRI models."""
+    """
+    Base model for IRI models.
 
-    model_config = ConfigDict(extra="allow")
+    Undeclared input keys are ignored: they are dropped at validation time and never stored or serialized.
+    Facility adapters that need to carry their own data on a model must declare it as a field on a subclass
+    (with exclude=True if it must not appear in responses).
+    """
 
-    @model_serializer(mode="wrap")
-    def _hide_extra(self, handler, info):
-        data = handler(self)
-
-        model_fields = set(self.model_fields or {})
-        computed_fields = set(self.model_computed_fields or {})
-        extra = getattr(self, "__pydantic_extra__", {}) or {}
-        for k in extra:
-            if k not in model_fields and k not in computed_fields:
-                data.pop(k, None)
-        return data
+    model_config = ConfigDict(extra="ignore")
 
     def get_extra(self, key, default=None):
-        """Get an extra field value that is not defined in the model. Returns default if not found."""
-        return getattr(self, "__pydantic_extra__", {}).get(key, default)
+        """Deprecated: undeclared fields are no longer kept, so this always returns default."""
+        warnings.warn(
+            "IRIBaseModel.get_extra() is deprecated: undeclared fields are ignored, declare them as fields on a subclass instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return default
 
     @classmethod
     def normalize_dt(cls, dt: datetime) -> datetime:
@@ -60,7 +61,12 @@ class NamedObject(IRIBaseModel):
     @property
     def self_uri(self) -> str:
         """Computed self URI property."""
-        return f"{get_url_prefix()}{self._self_path()}"
+        return get_url_prefix() + self._self_path()
+
+    def _uri_list(self, path: str, ids: list[str]) -> list[str]:
+        """Return the URI of each id under `path`."""
+        base = get_url_prefix() + path
+        return [base + i for i in ids]
 
     name: str|None = Field(default=None, description="The long name of the object.", example="Perlmutter GPU")
     description: str|None = Field(default=None, description="Human-readable description of the object.", example="High-performance GPU compute resource")
@@ -79,6 +85,15 @@ class NamedObject(IRIBaseModel):
 
         return matches[0]
 
+    @staticmethod
+    def _page(items, offset=None, limit=None):
+        """Return the offset/limit window of items, consuming a lazy iterable only up to the end of the window."""
+        start = offset if offset and offset > 0 else 0
+        stop = start + limit if limit is not None and limit >= 0 else None
+        if isinstance(items, list):
+            return items[start:stop] if start or stop is not None else items
+        return list(itertools.islice(items, start, stop))
+
     @classmethod
     def find(cls, items, name=None, description=None, modified_since=None):
         """Find objects matching the given criteria."""
@@ -90,13 +105,13 @@ class NamedObject(IRIBaseModel):
             items = [items]
             single = True
 
-        if name:
-            items = [item for item in items if item.name == name]
-        if description:
-            items = [item for item in items if item.description and description in item.description]
-        if modified_since:
-            modified_since = cls.normalize_dt(modified_since)
-            items = [item for item in items if item.last_modified and item.last_modified >= modified_since]
+        modified_since = cls.normalize_dt(modified_since) if modified_since else None
+        items = [
+            item for item in items
+            if (not name or item.name == name)
+            and (not description or (item.description and description in item.description))
+            and (not modified_since or (item.last_modified and item.last_modified >= modified_since))
+        ]
         if single:
             return items[0] if items else None
         return items
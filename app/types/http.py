@@ -1,10 +1,12 @@
 """HTTP-related types and utilities for the IRI Facility API"""
 
 import datetime
+import functools
 from email.utils import parsedate_to_datetime
-from urllib.parse import parse_qs
+from urllib.parse import unquote_plus
 
-from fastapi import HTTPException, Request, status
+from fastapi import HTTPException, Request, Response, status
+from pydantic import TypeAdapter
 
 from .scalars import StrictDateTime
 
@@ -55,24 +57,69 @@ def modifiedSinceDatetime(modified_since: str | None, header_modified_since: str
 # forbidExtraQueryParams: a dependency to forbid extra query parameters
 
 
+def _query_key_counts(query: str) -> dict[str, int]:
+    """
+    Count the occurrences of each key in a query string, in first-seen order.
+    Only keys are inspected, so values are never decoded; keys are only
+    percent-decoded when they actually contain an escape.
+    Blank fields are skipped and a key without "=" counts as present (like parse_qs with keep_blank_values=True).
+    """
+    counts: dict[str, int] = {}
+    if not query:
+        return counts
+    for field in query.split("&"):
+        if not field:
+            continue
+        key = field.split("=", 1)[0]
+        if "%" in key or "+" in key:
+            key = unquote_plus(key)
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
 def forbidExtraQueryParams(*allowedParams: str, multiParams: set[str] | None = None):
     """Dependency to forbid extra query parameters. If allowedParams contains "*", all params are allowed."""
-    multiParams = multiParams or set()
+    return _query_param_checker(frozenset(allowedParams), frozenset(multiParams or ()))
 
-    async def checker(req: Request):
-        if "*" in allowedParams:
+
+@functools.lru_cache(maxsize=None)
+def _query_param_checker(allowed: frozenset[str], multiParams: frozenset[str]):
+    """Build (once per distinct parameter set) the checker used by forbidExtraQueryParams."""
+    if "*" in allowed:
+        async def allow_all(req: Request):
             return
 
-        raw_qs = req.scope.get("query_string", b"")
-        parsed = parse_qs(raw_qs.decode("utf-8", errors="strict"), keep_blank_values=True)
+        return allow_all
 
-        allowed = set(allowedParams)
+    async def checker(req: Request):
+        raw_qs = req.scope.get("query_string", b"")
+        if not raw_qs:
+            return
 
-        for key, values in parsed.items():
+        for key, count in _query_key_counts(raw_qs.decode("utf-8", errors="strict")).items():
             if key not in allowed:
                 raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=[{"type": "extra_forbidden", "loc": ["query", key], "msg": f"Unexpected query parameter: {key}"}])
 
-            if len(values) > 1 and key not in multiParams:
+            if count > 1 and key not in multiParams:
                 raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=[{"type": "duplicate_forbidden", "loc": ["query", key], "msg": f"Duplicate query parameter: {key}"}])
 
     return checker
+
+
+# -----------------------------------------------------------------------
+# model_response: serialize models straight to a JSON response
+
+
+@functools.lru_cache(maxsize=None)
+def _type_adapter(response_type) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def model_response(response_type, content, *, exclude_none: bool = True, exclude_unset: bool = False) -> Response:
+    """
+    Serialize content (a model or a list of models) as response_type directly to JSON bytes.
+    This skips FastAPI's jsonable_encoder and response-model round trip; by default None values are dropped,
+    matching response_model_exclude_none=True. Declare response_model=response_type on the route for the OpenAPI schema.
+    """
+    body = _type_adapter(response_type).dump_json(content, exclude_none=exclude_none, exclude_unset=exclude_unset)
+    return Response(content=body, media_type="application/json")
@@ -9,6 +9,10 @@ from pydantic_core import core_schema
 
 # -----------------------------------------------------------------------
 # StrictHTTPBool: a strict boolean type
+# Common spellings resolve with a single lookup; anything else is stripped and lowercased first.
+_HTTP_BOOL_VALUES = {"true": True, "false": False, "True": True, "False": False, "TRUE": True, "FALSE": False}
+
+
 class StrictHTTPBool:
     """Strict boolean:
     - Accepts: real booleans, 'true', 'false'
@@ -22,14 +26,15 @@ class StrictHTTPBool:
     @staticmethod
     def validate(value):
         """Validate the input value as a strict boolean."""
-        if isinstance(value, bool):
+        value_type = type(value)
+        if value_type is bool:
             return value
-        if isinstance(value, str):
-            v = value.strip().lower()
-            if v == "true":
-                return True
-            if v == "false":
-                return False
+        if value_type is str:
+            result = _HTTP_BOOL_VALUES.get(value)
+            if result is None:
+                result = _HTTP_BOOL_VALUES.get(value.strip().lower())
+            if result is not None:
+                return result
             raise ValueError("Invalid boolean value. Expected 'true' or 'false'.")
         raise ValueError("Invalid boolean value. Expected true/false or 'true'/'false'.")
 
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Regression tests for the per-router cache of verified bearer tokens."""
+
+import os
+import unittest
+from unittest import mock
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("IRI_SHOW_MISSING_ROUTES", "true")
+
+from app.routers import iri_router
+from app.routers.iri_router import AuthenticatedAdapter, IriRouter
+from app.types.user import User
+
+
+class CountingAdapter(AuthenticatedAdapter):
+    """Accepts the token "good" and counts how often each token is checked."""
+
+    def __init__(self):
+        self.checks: dict[str, int] = {}
+
+    async def get_current_user(self, api_key, client_ip):
+        self.checks[api_key] = self.checks.get(api_key, 0) + 1
+        if api_key != "good":
+            raise Exception("Invalid token")
+        return "user-1"
+
+    async def get_current_user_globus(self, api_key, client_ip, globus_introspect):
+        return None
+
+    async def get_user(self, user_id, api_key, client_ip, globus_introspect):
+        return User(id=user_id, name="Test User", api_key=api_key, client_ip=client_ip)
+
+
+class AuthCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.router = IriRouter(prefix="/authcache", router_adapter=AuthenticatedAdapter)
+        self.router.adapter = self.adapter = CountingAdapter()
+
+        @self.router.get("/whoami")
+        async def whoami(user: User = Depends(self.router.current_user)):
+            return {"id": user.id}
+
+        app = FastAPI()
+        app.include_router(self.router)
+        self.client = TestClient(app)
+        self.now = 1_000_000.0
+        patcher = mock.patch.object(iri_router.time, "time", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _whoami(self, token: str):
+        return self.client.get("/authcache/whoami", headers={"Authorization": f"Bearer {token}"})
+
+    def test_verified_token_is_checked_once_within_the_ttl(self):
+        for _ in range(3):
+            response = self._whoami("good")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), {"id": "user-1"})
+        self.assertEqual(self.adapter.checks["good"], 1)
+
+    def test_verified_token_is_checked_again_after_the_ttl(self):
+        self._whoami("good")
+        self.now += iri_router.AUTH_CACHE_TTL_SECS - 1
+        self._whoami("good")
+        self.assertEqual(self.adapter.checks["good"], 1)
+        self.now += 2
+        self.assertEqual(self._whoami("good").status_code, 200)
+        self.assertEqual(self.adapter.checks["good"], 2)
+
+    def test_token_expiry_shortens_the_ttl(self):
+        async def get_globus_info(api_key):
+            return {"exp": self.now + 5}
+
+        async def get_current_user_globus(api_key, client_ip, globus_introspect):
+            return "user-1"
+
+        with mock.patch.multiple(iri_router, GLOBUS_RS_ID="id", GLOBUS_RS_SECRET="secret", GLOBUS_RS_SCOPE_SUFFIX="scope"), \
+                mock.patch.object(self.router, "get_globus_info", get_globus_info), \
+                mock.patch.object(self.adapter, "get_current_user_globus", mock.AsyncMock(side_effect=get_current_user_globus)) as globus_user:
+            self._whoami("good")
+            self.now += 6
+            self._whoami("good")
+        self.assertEqual(globus_user.await_count, 2)
+
+    def test_rejected_token_is_not_cached(self):
+        for _ in range(3):
+            self.assertEqual(self._whoami("bad").status_code, 401)
+        self.assertEqual(self.adapter.checks["bad"], 3)
+        self.assertEqual(self.router._auth_cache, {})
+
+    def test_zero_ttl_checks_every_request(self):
+        with mock.patch.object(iri_router, "AUTH_CACHE_TTL_SECS", 0):
+            for _ in range(3):
+                self.assertEqual(self._whoami("good").status_code, 200)
+        self.assertEqual(self.adapter.checks["good"], 3)
+        self.assertEqual(self.router._auth_cache, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
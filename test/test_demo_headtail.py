@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Regression tests comparing the demo adapter's mmap/preadv head, tail and view with coreutils head and tail."""
+
+import asyncio
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+os.environ.setdefault("IRI_SHOW_MISSING_ROUTES", "true")
+
+from app.demo_adapter import DemoAdapter, PathSandbox
+
+FILES = {
+    "empty": b"",
+    "lines": b"one\ntwo\nthree\nfour\nfive\n",
+    "no_trailing_newline": b"one\ntwo\nthree",
+    "blank_lines": b"\n\nx\n\n",
+    "digits": b"0123456789",
+}
+COUNTS = (0, 1, 2, 3, 10)
+
+
+class DemoHeadTailTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.adapter = DemoAdapter()
+        cls.user = cls.adapter.user
+
+    def setUp(self):
+        self._saved_base = PathSandbox._base_temp_dir
+        self.base = os.path.realpath(tempfile.mkdtemp())
+        PathSandbox._base_temp_dir = self.base
+        for name, content in FILES.items():
+            with open(os.path.join(self.base, name), "wb") as f:
+                f.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.base)
+        PathSandbox._base_temp_dir = self._saved_base
+
+    def _coreutils(self, *args: str) -> str:
+        return subprocess.run(list(args), cwd=self.base, capture_output=True, check=True).stdout.decode(errors="replace")
+
+    def _head(self, name, file_bytes=None, lines=None, skip_trailing=False) -> str:
+        return asyncio.run(self.adapter.head(None, self.user, name, file_bytes, lines, skip_trailing)).output.content
+
+    def _tail(self, name, file_bytes=None, lines=None, skip_heading=False) -> str:
+        return asyncio.run(self.adapter.tail(None, self.user, name, file_bytes, lines, skip_heading)).output.content
+
+    def test_lines_match_head_and_tail(self):
+        for name in FILES:
+            for n in COUNTS:
+                with self.subTest(name=name, n=n):
+                    self.assertEqual(self._head(name, lines=n), self._coreutils("head", "-n", str(n), name))
+                    self.assertEqual(self._head(name, lines=n, skip_trailing=True), self._coreutils("head", "-n", f"-{n}", name))
+                    self.assertEqual(self._tail(name, lines=n), self._coreutils("tail", "-n", str(n), name))
+                    self.assertEqual(self._tail(name, lines=n, skip_heading=True), self._coreutils("tail", "-n", f"+{n + 1}", name))
+
+    def test_bytes_match_head_and_tail(self):
+        for name in FILES:
+            for n in COUNTS:
+                with self.subTest(name=name, n=n):
+                    self.assertEqual(self._head(name, file_bytes=n), self._coreutils("head", "-c", str(n), name))
+                    self.assertEqual(self._head(name, file_bytes=n, skip_trailing=True), self._coreutils("head", "-c", f"-{n}", name))
+                    self.assertEqual(self._tail(name, file_bytes=n), self._coreutils("tail", "-c", str(n), name))
+                    self.assertEqual(self._tail(name, file_bytes=n, skip_heading=True), self._coreutils("tail", "-c", f"+{n + 1}", name))
+
+    def test_view_reads_the_requested_byte_range(self):
+        content = FILES["digits"]
+        for offset, size in ((0, 4), (3, 4), (8, 10), (10, 4), (20, 4), (0, 0)):
+            with self.subTest(offset=offset, size=size):
+                output = asyncio.run(self.adapter.view(None, self.user, "digits", size, offset)).output
+                expected = content[offset : offset + size].decode()
+                self.assertEqual(output.content, expected)
+                self.assertEqual(output.start_position, offset)
+                self.assertEqual(output.end_position, offset + len(expected))
+
+    def test_view_of_an_empty_file_is_empty(self):
+        output = asyncio.run(self.adapter.view(None, self.user, "empty", 16, 0)).output
+        self.assertEqual(output.content, "")
+        self.assertEqual(output.end_position, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
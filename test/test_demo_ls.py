@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Regression tests comparing the demo adapter's scandir-based ls with coreutils ls."""
+
+import asyncio
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+os.environ.setdefault("IRI_SHOW_MISSING_ROUTES", "true")
+
+from app.demo_adapter import DemoAdapter, PathSandbox
+
+
+def _coreutils_ls(args: list[str], cwd: str) -> list[str]:
+    """Run ls and return the listed names, prefixed by their directory (relative to cwd) for recursive listings."""
+    # ls exits non-zero for the broken link and the unreadable directory; like the adapter, it still lists the rest
+    out = subprocess.run(["ls", "-1", *args], cwd=cwd, env={**os.environ, "LC_ALL": "C"}, capture_output=True, text=True).stdout
+    names = []
+    prefix = ""
+    for line in out.splitlines():
+        if not line:
+            continue
+        if line.endswith(":"):
+            # Section header of a recursive listing ("./sub:") or of a directory operand ("sub:")
+            header = line[:-1]
+            prefix = "" if header in (".", "") or "-R" not in args else header.removeprefix("./") + "/"
+            continue
+        names.append(prefix + line)
+    return sorted(names)
+
+
+class DemoLsTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.adapter = DemoAdapter()
+        cls.user = cls.adapter.user
+
+    def setUp(self):
+        self._saved_base = PathSandbox._base_temp_dir
+        self.base = os.path.realpath(tempfile.mkdtemp())
+        PathSandbox._base_temp_dir = self.base
+
+        # tree/
+        #   .hidden  a.txt  broken -> nowhere  locked/ (mode 000)  sub/  sublink -> sub
+        #   sub/b.txt  sub/deep/c.log  sub/up -> .. (a loop when dereferenced)
+        self.tree = os.path.join(self.base, "tree")
+        os.makedirs(os.path.join(self.tree, "sub", "deep"))
+        os.makedirs(os.path.join(self.tree, "locked"))
+        for name in (".hidden", "a.txt", "sub/b.txt", "sub/deep/c.log", "locked/secret"):
+            with open(os.path.join(self.tree, name), "w", encoding="utf-8") as f:
+                f.write(name)
+        os.symlink("nowhere", os.path.join(self.tree, "broken"))
+        os.symlink("..", os.path.join(self.tree, "sub", "up"))
+        os.symlink("sub", os.path.join(self.tree, "sublink"))
+        os.chmod(os.path.join(self.tree, "locked"), 0)
+
+    def tearDown(self):
+        os.chmod(os.path.join(self.tree, "locked"), 0o755)
+        shutil.rmtree(self.base)
+        PathSandbox._base_temp_dir = self._saved_base
+
+    def _ls(self, path: str, show_hidden: bool = False, recursive: bool = False, dereference: bool = False):
+        return asyncio.run(self.adapter.ls(None, self.user, path, show_hidden, False, recursive, dereference)).output
+
+    def _names(self, path: str, **kwargs) -> list[str]:
+        return sorted(f.name for f in self._ls(path, **kwargs))
+
+    def test_listing_matches_ls(self):
+        self.assertEqual(self._names("tree"), _coreutils_ls([], self.tree))
+
+    def test_show_hidden_matches_ls_almost_all(self):
+        self.assertEqual(self._names("tree", show_hidden=True), _coreutils_ls(["-A"], self.tree))
+
+    def test_recursive_matches_ls_r(self):
+        self.assertEqual(self._names("tree", recursive=True), _coreutils_ls(["-R"], self.tree))
+
+    def test_recursive_dereference_matches_ls_rl(self):
+        # The sub/up loop is listed but not descended into; sublink is listed again through the link, as ls -RL does
+        names = self._names("tree", recursive=True, dereference=True)
+        self.assertEqual(names, _coreutils_ls(["-R", "-L"], self.tree))
+        self.assertIn("sublink/deep/c.log", names)
+        self.assertNotIn("sub/up/a.txt", names)
+
+    def test_dangling_link_is_reported_as_the_link(self):
+        for dereference in (False, True):
+            with self.subTest(dereference=dereference):
+                broken = next(f for f in self._ls("tree", dereference=dereference) if f.name == "broken")
+                self.assertEqual(broken.type, "symlink")
+                self.assertEqual(broken.link_target, "nowhere")
+
+    def test_unreadable_directory_does_not_fail_the_listing(self):
+        # Mode 000 does not stop root, so make reading the directory fail explicitly as well
+        scandir = os.scandir
+
+        def failing_scandir(path):
+            if os.path.basename(path) == "locked":
+                raise PermissionError(13, "Permission denied", path)
+            return scandir(path)
+
+        with mock.patch("app.demo_adapter.os.scandir", failing_scandir):
+            names = self._names("tree", recursive=True)
+        self.assertIn("locked", names)
+        self.assertNotIn("locked/secret", names)
+        self.assertIn("sub/deep/c.log", names)
+
+    def test_glob_patterns_match_ls(self):
+        for pattern in ("*.txt", "s?b"):
+            with self.subTest(pattern=pattern):
+                expected = subprocess.run(
+                    ["sh", "-c", f"ls -1 {pattern}"], cwd=self.tree, env={**os.environ, "LC_ALL": "C"}, capture_output=True, text=True
+                ).stdout
+                # Directory operands are listed by their contents, under a "dir:" header that the adapter does not emit
+                expected_names = sorted(line for line in expected.splitlines() if line and not line.endswith(":"))
+                self.assertEqual(self._names(f"tree/{pattern}"), expected_names)
+
+
+if __name__ == "__main__":
+    unittest.main()
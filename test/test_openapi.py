@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Regression tests for the pre-rendered OpenAPI document and the docs pages that point at it."""
+
+import gzip
+import os
+import unittest
+
+import orjson
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("IRI_SHOW_MISSING_ROUTES", "true")
+
+from app.main import APP
+
+
+class OpenApiTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(APP)
+
+    def _get(self, accept_encoding: str):
+        # Read the raw body so the test sees exactly what was sent, without httpx decoding it
+        with self.client.stream("GET", APP.openapi_url, headers={"Accept-Encoding": accept_encoding}) as response:
+            return response, b"".join(response.iter_raw())
+
+    def test_openapi_without_gzip_is_plain_json(self):
+        response, body = self._get("identity")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/json")
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(orjson.loads(body), APP.openapi())
+
+    def test_openapi_with_gzip_is_compressed(self):
+        plain = self._get("identity")[1]
+        response, body = self._get("gzip")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(gzip.decompress(body), plain)
+
+    def test_docs_pages_point_at_the_openapi_document(self):
+        for url in (APP.docs_url, APP.redoc_url):
+            if not url:
+                continue
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn(APP.openapi_url, response.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
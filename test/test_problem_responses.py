@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Regression tests checking that the pre-encoded problem bodies are valid Problem documents."""
+
+import os
+import unittest
+
+from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("IRI_SHOW_MISSING_ROUTES", "true")
+
+from app.routers.error_handlers import _GENERIC_PROBLEM, _STATUS_PROBLEMS, Problem, install_error_handlers
+from app.types.http import forbidExtraQueryParams
+
+
+class ProblemResponseTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        app = FastAPI()
+        install_error_handlers(app)
+
+        @app.get("/status/{code}")
+        async def raise_status(code: int, detail: str = ""):
+            # An empty detail selects the handler's default (None would make Starlette use the reason phrase)
+            raise HTTPException(status_code=code, detail=detail)
+
+        @app.get("/validated", dependencies=[Depends(forbidExtraQueryParams("limit"))])
+        async def validated(limit: int = Query(...)):
+            return {}
+
+        @app.get("/broken")
+        async def broken():
+            raise RuntimeError("boom")
+
+        cls.client = TestClient(app, raise_server_exceptions=False)
+
+    def _problem(self, response, status: int) -> Problem:
+        self.assertEqual(response.status_code, status)
+        self.assertEqual(response.headers["content-type"], "application/problem+json")
+        problem = Problem.model_validate(response.json())
+        self.assertEqual(problem.status, status)
+        self.assertTrue(problem.instance.startswith("http://testserver/"))
+        return problem
+
+    def test_every_status_problem_is_valid(self):
+        for status, (title, default_detail, problem_type, extra_headers) in _STATUS_PROBLEMS.items():
+            with self.subTest(status=status):
+                problem = self._problem(self.client.get(f"/status/{status}"), status)
+                self.assertEqual(problem.title, title)
+                self.assertEqual(problem.detail, default_detail)
+                self.assertEqual(problem.type, f"http://testserver/problems/{problem_type}")
+                self.assertEqual(problem.instance, f"http://testserver/status/{status}")
+
+    def test_custom_detail_is_encoded(self):
+        detail = 'Resource "ünïcode" \\ not found'
+        problem = self._problem(self.client.get("/status/404", params={"detail": detail}), 404)
+        self.assertEqual(problem.detail, detail)
+
+    def test_unlisted_status_uses_the_generic_problem(self):
+        problem = self._problem(self.client.get("/status/418"), 418)
+        self.assertEqual(problem.title, _GENERIC_PROBLEM[0])
+        self.assertEqual(problem.detail, _GENERIC_PROBLEM[1])
+
+    def test_unauthorized_has_a_bearer_challenge(self):
+        response = self.client.get("/status/401")
+        self._problem(response, 401)
+        self.assertEqual(response.headers["www-authenticate"], "Bearer")
+
+    def test_unknown_route_is_not_found(self):
+        problem = self._problem(self.client.get("/nowhere?q=a b"), 404)
+        self.assertEqual(problem.title, "Not Found")
+
+    def test_wrong_method_is_not_allowed(self):
+        response = self.client.post("/validated")
+        self._problem(response, 405)
+        self.assertIn("allow", response.headers)
+
+    def test_unprocessable_entity_joins_the_error_messages(self):
+        problem = self._problem(self.client.get("/validated", params={"limit": "1", "foo": "2"}), 422)
+        self.assertEqual(problem.detail, "Unexpected query parameter: foo")
+
+    def test_validation_error_lists_invalid_params(self):
+        problem = self._problem(self.client.get("/validated", params={"limit": "many"}), 400)
+        self.assertEqual(problem.title, "Invalid parameter")
+        self.assertEqual([param["name"] for param in problem.invalid_params], ["limit"])
+
+    def test_unhandled_exception_is_an_internal_error(self):
+        problem = self._problem(self.client.get("/broken"), 500)
+        self.assertEqual(problem.title, "Internal Server Error")
+        self.assertNotIn("boom", problem.detail)
+
+
+if __name__ == "__main__":
+    unittest.main()
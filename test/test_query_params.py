@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Regression tests for forbidExtraQueryParams and the query-string key counting behind it."""
+
+import os
+import unittest
+from urllib.parse import parse_qsl
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("IRI_SHOW_MISSING_ROUTES", "true")
+
+from app.types.http import _query_key_counts, forbidExtraQueryParams
+
+
+def _parse_qs_counts(query: str) -> dict[str, int]:
+    """The reference behaviour: key counts as parse_qs(keep_blank_values=True) sees them."""
+    counts: dict[str, int] = {}
+    for key, _ in parse_qsl(query, keep_blank_values=True):
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+class QueryKeyCountTests(unittest.TestCase):
+    def test_matches_parse_qs(self):
+        for query in ("", "limit=1", "lim%69t=1", "a+b=1", "a%2Bb=1", "limit", "limit=&limit=2", "&&limit=1&", "x=a%26b&y=1+2", "k=v=w"):
+            with self.subTest(query=query):
+                self.assertEqual(_query_key_counts(query), _parse_qs_counts(query))
+
+
+class ForbidExtraQueryParamsTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        app = FastAPI()
+
+        @app.get("/items", dependencies=[Depends(forbidExtraQueryParams("limit", "a b", "tag", multiParams={"tag"}))])
+        async def items():
+            return {}
+
+        @app.get("/anything", dependencies=[Depends(forbidExtraQueryParams("*"))])
+        async def anything():
+            return {}
+
+        cls.client = TestClient(app)
+
+    def _get(self, path: str, query: str):
+        # Pass the query string through untouched, so httpx does not re-encode the escapes under test
+        return self.client.get(f"{path}?{query}" if query else path)
+
+    def _assert_rejected(self, query: str, error_type: str, key: str):
+        response = self._get("/items", query)
+        self.assertEqual(response.status_code, 422)
+        detail = response.json()["detail"]
+        self.assertEqual(detail[0]["type"], error_type)
+        self.assertEqual(detail[0]["loc"], ["query", key])
+
+    def test_allowed_params_pass(self):
+        for query in ("", "limit=1", "limit=1&tag=x", "tag=x&tag=y", "limit", "&&limit=1&"):
+            with self.subTest(query=query):
+                self.assertEqual(self._get("/items", query).status_code, 200)
+
+    def test_percent_encoded_key_is_decoded(self):
+        self.assertEqual(self._get("/items", "lim%69t=1").status_code, 200)
+        self._assert_rejected("lim%69t=1&limit=2", "duplicate_forbidden", "limit")
+
+    def test_plus_in_key_is_a_space(self):
+        self.assertEqual(self._get("/items", "a+b=1").status_code, 200)
+        self.assertEqual(self._get("/items", "a%20b=1").status_code, 200)
+        self._assert_rejected("a%2Bb=1", "extra_forbidden", "a+b")
+
+    def test_repeated_single_valued_param_is_rejected(self):
+        self._assert_rejected("limit=1&limit=2", "duplicate_forbidden", "limit")
+        self._assert_rejected("limit&limit", "duplicate_forbidden", "limit")
+
+    def test_unknown_param_is_rejected(self):
+        self._assert_rejected("foo=1", "extra_forbidden", "foo")
+        self._assert_rejected("limit=1&Limit=2", "extra_forbidden", "Limit")
+
+    def test_wildcard_allows_anything(self):
+        self.assertEqual(self._get("/anything", "foo=1&foo=2&lim%69t=3").status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()